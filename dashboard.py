@@ -1264,6 +1264,14 @@ def create_dark_template():
         }
     }
 
+@st.cache_resource
+def get_http_session():
+    """Pooled HTTP session reused across chat messages and reruns"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=3)
+    session.mount('https://', adapter)
+    return session
+
 def send_chat_message(message, conversation_history):
     """Send message to the chat API"""
     api_url = "https://bjbarl518f.execute-api.us-west-2.amazonaws.com/PROD"
@@ -1289,7 +1297,7 @@ def send_chat_message(message, conversation_history):
     }
     
     try:
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
+        response = get_http_session().post(api_url, headers=headers, json=payload, timeout=30)
         
         if response.status_code == 200:
             response_data = response.json()
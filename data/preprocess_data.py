@@ -5,7 +5,7 @@ Data preprocessing utilities for customer service chat data
 import json
 import pandas as pd
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Dict, List, Any, Tuple
 from collections import defaultdict
 import re
@@ -389,27 +389,24 @@ class ChatDataPreprocessor:
     
     def _analyze_temporal_patterns(self, conversations: Dict[str, Dict]) -> Dict[str, Any]:
         """Analyze temporal patterns in the data"""
-        timestamps = []
-        durations = []
-        
-        for conv in conversations.values():
-            try:
-                # Parse timestamp
-                dt = datetime.fromisoformat(conv['start_time'].replace('+10:00', ''))
-                timestamps.append(dt)
-                durations.append(conv['duration_seconds'])
-            except:
-                continue
+        df = pd.DataFrame({
+            'start_time': [conv['start_time'] for conv in conversations.values()],
+            'duration': [conv['duration_seconds'] for conv in conversations.values()]
+        })
+        
+        # Parse every timestamp in one vectorized call (local time, offset
+        # dropped); unparseable values are skipped
+        df['timestamp'] = pd.to_datetime(
+            df['start_time'].str.replace('+10:00', '', regex=False),
+            format='ISO8601',
+            errors='coerce'
+        )
+        df = df.dropna(subset=['timestamp'])
         
-        if not timestamps:
+        if df.empty:
             return {}
         
         # Analyze patterns
-        df = pd.DataFrame({
-            'timestamp': timestamps,
-            'duration': durations
-        })
-        
         df['hour'] = df['timestamp'].dt.hour
         df['day_of_week'] = df['timestamp'].dt.dayofweek
         df['month'] = df['timestamp'].dt.month
@@ -1,148 +1,334 @@
 import json
+import re
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
+from concurrent.futures import ProcessPoolExecutor
 
-def load_and_process_chat_data(file_path):
-    """Load and process chat data into analytics format"""
+# Try to import optional multi-pattern matcher
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Try to import optional SIMD multi-pattern matcher (used when ahocorasick is missing)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Try to import optional streaming JSON parser
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Keyword tables used to simulate analytics (ordered by topic priority)
+TOPIC_KEYWORDS = (
+    ('Billing', ('bill', 'charge', 'payment', 'cost', 'invoice')),
+    ('Technical Support', ('technical', 'not working', 'problem', 'issue', 'broken')),
+    ('Roaming', ('roaming', 'travel', 'international', 'overseas')),
+    ('Account Management', ('account', 'profile', 'password', 'login')),
+    ('Cancellation', ('cancel', 'close', 'terminate', 'end service')),
+    ('Service Issues', ('service', 'network', 'signal', 'coverage')),
+    ('Data Usage', ('data', 'internet', 'usage', 'limit')),
+    ('Payment', ('payment', 'pay', 'credit card', 'bank')),
+    ('International Plans', ('international', 'global', 'worldwide')),
+    ('Device Support', ('phone', 'device', 'mobile', 'smartphone'))
+)
+TOPICS = tuple(topic for topic, _ in TOPIC_KEYWORDS)
+SENTIMENT_INDICATORS = ('thank', 'great', 'good', 'excellent', 'satisfied')
+NEGATIVE_INDICATORS = ('frustrated', 'angry', 'terrible', 'worst', 'cancel')
+RESOLUTION_KEYWORDS = ('resolved', 'solved', 'fixed', 'helped', 'thank you')
+ESCALATION_KEYWORDS = ('manager', 'supervisor', 'escalate', 'complaint')
+
+# Category orders for the categorical output columns ('General' is the no-topic fallback)
+PRIMARY_TOPICS = TOPICS + ('General',)
+OUTCOMES = ('escalated', 'successful', 'unsuccessful')
+USER_TYPES = ('customer', 'agent')
+
+AGENTS = ('Jessica', 'Michael', 'Sarah', 'David', 'Emily', 'James', 'Lisa', 'Robert', 'Anna', 'Tom')
+AGENT_IDS = tuple(f"agent_{i}" for i in range(10))
+
+_ALL_KEYWORDS = sorted(
+    {keyword for _, keywords in TOPIC_KEYWORDS for keyword in keywords}
+    .union(SENTIMENT_INDICATORS, NEGATIVE_INDICATORS, RESOLUTION_KEYWORDS, ESCALATION_KEYWORDS)
+)
+_KEYWORD_INDEX = {keyword: i for i, keyword in enumerate(_ALL_KEYWORDS)}
+
+# Each keyword owns one bit, so a conversation's hits pack into a single uint64
+if len(_ALL_KEYWORDS) > 64:
+    raise ValueError(f"Keyword bitsets hold at most 64 keywords, got {len(_ALL_KEYWORDS)}")
+
+def _keyword_mask(keywords):
+    """OR together the bits of the given keywords"""
+    mask = 0
+    for keyword in keywords:
+        mask |= 1 << _KEYWORD_INDEX[keyword]
+    return np.uint64(mask)
+
+_TOPIC_MASKS = tuple(_keyword_mask(keywords) for _, keywords in TOPIC_KEYWORDS)
+_POSITIVE_MASK = _keyword_mask(SENTIMENT_INDICATORS)
+_NEGATIVE_MASK = _keyword_mask(NEGATIVE_INDICATORS)
+_RESOLUTION_MASK = _keyword_mask(RESOLUTION_KEYWORDS)
+_ESCALATION_MASK = _keyword_mask(ESCALATION_KEYWORDS)
+
+def _popcount(bits):
+    """Count set bits of each uint64 with the SWAR popcount (np.bitwise_count needs NumPy 2)"""
+    bits = bits - ((bits >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    bits = (bits & np.uint64(0x3333333333333333)) + ((bits >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    bits = (bits + (bits >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (bits * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+def _build_keyword_automaton():
+    """Build an Aho-Corasick automaton over every analytics keyword"""
+    automaton = ahocorasick.Automaton()
+    for keyword, column in _KEYWORD_INDEX.items():
+        automaton.add_word(keyword, 1 << column)
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+
+def _build_keyword_database():
+    """Compile every analytics keyword into a single Hyperscan block-mode database"""
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=[re.escape(keyword).encode() for keyword in _ALL_KEYWORDS],
+        ids=list(range(len(_ALL_KEYWORDS))),
+        # Only presence matters, so report each keyword at most once per scan
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_ALL_KEYWORDS)
+    )
+    return database
+
+_KEYWORD_DATABASE = (
+    _build_keyword_database() if HYPERSCAN_AVAILABLE and not AHOCORASICK_AVAILABLE else None
+)
+
+def _scan_keyword_hits(texts):
+    """Return one uint64 keyword bitset per conversation"""
+    texts = pd.Series(texts, dtype=object)
+    
+    if _KEYWORD_AUTOMATON is not None:
+        bitsets = []
+        for text in texts:
+            bits = 0
+            for _, keyword_bit in _KEYWORD_AUTOMATON.iter(text):
+                bits |= keyword_bit
+            bitsets.append(bits)
+        return np.array(bitsets, dtype=np.uint64)
+    
+    if _KEYWORD_DATABASE is not None:
+        bitsets = [0] * len(texts)
+        
+        def on_match(column, start, end, flags, row):
+            bitsets[row] |= 1 << column
+        
+        for row, text in enumerate(texts):
+            _KEYWORD_DATABASE.scan(text.encode('utf-8'), match_event_handler=on_match, context=row)
+        return np.array(bitsets, dtype=np.uint64)
+    
+    hits = np.zeros(len(texts), dtype=np.uint64)
+    for column, keyword in enumerate(_ALL_KEYWORDS):
+        found = texts.str.contains(keyword, regex=False).to_numpy(dtype=np.uint64)
+        hits |= found << np.uint64(column)
+    return hits
+
+def _keyword_hits(texts, max_workers=None):
+    """Build the keyword bitsets, optionally scanning contiguous blocks of
+    conversations in worker processes (the matchers hold the GIL, so threads
+    would not help)"""
+    if not max_workers or max_workers < 2 or len(texts) < max_workers:
+        return _scan_keyword_hits(texts)
+    
+    blocks = np.array_split(np.asarray(texts, dtype=object), max_workers)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return np.concatenate(list(executor.map(_scan_keyword_hits, blocks)))
+
+def _score_conversations(texts, rng, max_workers=None):
+    """Derive primary topic, sentiment and outcome for every conversation at once"""
+    hits = _keyword_hits(texts, max_workers)
+    
+    # Primary topic is the first topic (in priority order) with any keyword hit,
+    # returned as codes into PRIMARY_TOPICS
+    topic_hits = np.column_stack([(hits & mask) != 0 for mask in _TOPIC_MASKS])
+    topic_codes = np.where(topic_hits.any(axis=1), topic_hits.argmax(axis=1), len(TOPICS))
+    
+    # Sentiment: -1 to 1 (based on conversation tone)
+    sentiment_scores = 0.3 * _popcount(hits & _POSITIVE_MASK) - 0.4 * _popcount(hits & _NEGATIVE_MASK)
+    sentiment_scores = np.clip(sentiment_scores + rng.uniform(-0.2, 0.2, len(texts)), -1.0, 1.0)
+    
+    # Outcome determination
+    escalated = (hits & _ESCALATION_MASK) != 0
+    successful = ((hits & _RESOLUTION_MASK) != 0) | (sentiment_scores > 0.3)
+    outcome_codes = np.select([escalated, successful], [0, 1], 2)
+    
+    return (
+        pd.Categorical.from_codes(topic_codes, categories=PRIMARY_TOPICS),
+        sentiment_scores,
+        pd.Categorical.from_codes(outcome_codes, categories=OUTCOMES)
+    )
+
+def _sample_secondary_topics(primary_topics, rng):
+    """Pick 0-2 distinct secondary topics per conversation, excluding its primary topic"""
+    topics = np.asarray(TOPICS, dtype=object)
+    topic_codes = primary_topics.codes
+    counts = rng.integers(0, 3, len(topic_codes))
+    
+    # Random sort keys per (conversation, topic); the primary topic always sorts last
+    sort_keys = rng.random((len(topic_codes), len(topics)))
+    has_topic = topic_codes < len(TOPICS)
+    sort_keys[np.flatnonzero(has_topic), topic_codes[has_topic]] = np.inf
+    order = sort_keys.argsort(axis=1)
+    
+    return [topics[order[i, :count]].tolist() for i, count in enumerate(counts)]
+
+def _load_chat_dataframe(file_path):
+    """Load the chat message array into a DataFrame"""
+    if not IJSON_AVAILABLE:
+        with open(file_path, 'r') as f:
+            return pd.DataFrame(json.load(f))
+    
+    # Stream records straight into the frame without first decoding the
+    # whole file into a list; records missing optional keys get NaN
+    with open(file_path, 'rb') as f:
+        return pd.DataFrame.from_records(ijson.items(f, 'item', use_float=True))
+
+def load_and_process_chat_data(file_path, seed=None, max_workers=None):
+    """Load and process chat data into analytics format
+    
+    Args:
+        file_path: Path to the raw chat JSON file
+        seed: Optional seed for the simulated analytics, for reproducible output
+        max_workers: Number of worker processes for keyword scanning (serial if None)
+    """
     
     # Load raw chat data
-    with open(file_path, 'r') as f:
-        raw_data = json.load(f)
+    df = _load_chat_dataframe(file_path)
     
-    # Convert to DataFrame
-    df = pd.DataFrame(raw_data)
+    # Lower-case the message column once rather than each joined conversation
+    df['chat_text'] = df['chat_text'].str.lower()
+    df['chat_user_type'] = df['chat_user_type'].astype(pd.CategoricalDtype(USER_TYPES))
     
-    # Process conversations by contact_id
-    conversations = []
-    topics_list = ['Billing', 'Technical Support', 'Roaming', 'Account Management', 'Cancellation', 
-                   'Service Issues', 'Data Usage', 'Payment', 'International Plans', 'Device Support']
+    # Sort once so each conversation is a contiguous run of rows; group
+    # boundaries then fall out of a single adjacent-row comparison
+    df = df.sort_values(['contact_id', 'message_number'], kind='stable', ignore_index=True)
+    contact_column = df['contact_id'].to_numpy()
+    is_group_start = np.ones(len(df), dtype=bool)
+    is_group_start[1:] = contact_column[1:] != contact_column[:-1]
+    starts = np.flatnonzero(is_group_start)
+    ends = np.append(starts[1:], len(df))
+    n_conversations = len(starts)
     
-    agents = ['Jessica', 'Michael', 'Sarah', 'David', 'Emily', 'James', 'Lisa', 'Robert', 'Anna', 'Tom']
+    # Per-conversation fields come from each group's first row
+    contact_ids = contact_column[starts]
+    start_dates = df['start_date'].to_numpy()[starts]
+    end_dates = df['end_date'].to_numpy()[starts]
+    customer_ids = df['chat_user_id'].to_numpy()[starts]
+    message_counts = (ends - starts).astype(np.int32)
     
-    for contact_id in df['contact_id'].unique():
-        conv_data = df[df['contact_id'] == contact_id].copy()
-        conv_data = conv_data.sort_values('message_number')
-        
-        # Extract conversation details
-        start_time = pd.to_datetime(conv_data['start_date'].iloc[0])
-        end_time = pd.to_datetime(conv_data['end_date'].iloc[0])
-        duration = (end_time - start_time).total_seconds() / 60
-        
+    # Fill remaining output columns by position (structure of arrays) rather
+    # than building one dict per conversation and transposing at the end
+    has_agent_messages = np.empty(n_conversations, dtype=bool)
+    conversation_texts = np.empty(n_conversations, dtype=object)
+    
+    texts = df['chat_text'].to_numpy()
+    is_customer = (df['chat_user_type'] == 'customer').to_numpy()
+    is_agent = (df['chat_user_type'] == 'agent').to_numpy()
+    
+    for i, (start, end) in enumerate(zip(starts, ends)):
         # Get messages
-        customer_messages = conv_data[conv_data['chat_user_type'] == 'customer']['chat_text'].tolist()
-        agent_messages = conv_data[conv_data['chat_user_type'] == 'agent']['chat_text'].tolist()
+        conv_texts = texts[start:end]
+        customer_messages = conv_texts[is_customer[start:end]].tolist()
+        agent_messages = conv_texts[is_agent[start:end]].tolist()
         
         # Simulate analytics (in real scenario, these would come from AI models)
-        full_conversation = ' '.join(customer_messages + agent_messages).lower()
-        
-        # Determine primary topic based on keywords
-        primary_topic = 'General'
-        for topic in topics_list:
-            keywords = {
-                'Billing': ['bill', 'charge', 'payment', 'cost', 'invoice'],
-                'Technical Support': ['technical', 'not working', 'problem', 'issue', 'broken'],
-                'Roaming': ['roaming', 'travel', 'international', 'overseas'],
-                'Account Management': ['account', 'profile', 'password', 'login'],
-                'Cancellation': ['cancel', 'close', 'terminate', 'end service'],
-                'Service Issues': ['service', 'network', 'signal', 'coverage'],
-                'Data Usage': ['data', 'internet', 'usage', 'limit'],
-                'Payment': ['payment', 'pay', 'credit card', 'bank'],
-                'International Plans': ['international', 'global', 'worldwide'],
-                'Device Support': ['phone', 'device', 'mobile', 'smartphone']
-            }
-            
-            if any(keyword in full_conversation for keyword in keywords.get(topic, [])):
-                primary_topic = topic
-                break
-        
-        # Generate simulated analytics
-        # Sentiment: -1 to 1 (based on conversation tone)
-        sentiment_indicators = ['thank', 'great', 'good', 'excellent', 'satisfied']
-        negative_indicators = ['frustrated', 'angry', 'terrible', 'worst', 'cancel']
-        
-        sentiment_score = 0.0
-        for indicator in sentiment_indicators:
-            if indicator in full_conversation:
-                sentiment_score += 0.3
-        for indicator in negative_indicators:
-            if indicator in full_conversation:
-                sentiment_score -= 0.4
-        
-        sentiment_score = max(-1.0, min(1.0, sentiment_score + random.uniform(-0.2, 0.2)))
-        
-        # Empathy score (0 to 1) - based on agent responses
-        empathy_score = random.uniform(0.6, 1.0) if len(agent_messages) > 0 else 0.5
-        
-        # Outcome determination
-        resolution_keywords = ['resolved', 'solved', 'fixed', 'helped', 'thank you']
-        escalation_keywords = ['manager', 'supervisor', 'escalate', 'complaint']
-        
-        if any(keyword in full_conversation for keyword in escalation_keywords):
-            outcome = 'escalated'
-        elif any(keyword in full_conversation for keyword in resolution_keywords) or sentiment_score > 0.3:
-            outcome = 'successful'
-        else:
-            outcome = 'unsuccessful'
-        
-        # Create conversation record
-        conversation = {
-            'conversation_id': contact_id,
-            'contact_id': contact_id,
-            'start_date': start_time,
-            'end_date': end_time,
-            'duration_minutes': duration,
-            'agent_id': f"agent_{hash(contact_id) % 10}",
-            'agent_name': agents[hash(contact_id) % len(agents)],
-            'customer_id': conv_data['chat_user_id'].iloc[0],
-            'outcome': outcome,
-            'outcome_confidence': random.uniform(0.7, 0.95),
-            'primary_topic': primary_topic,
-            'secondary_topics': random.sample([t for t in topics_list if t != primary_topic], 
-                                            random.randint(0, 2)),
-            'sentiment_score': sentiment_score,
-            'empathy_score': empathy_score,
-            'message_count': len(conv_data),
-            'resolution_time_minutes': duration
-        }
-        
-        conversations.append(conversation)
+        conversation_texts[i] = ' '.join(customer_messages + agent_messages)
+        has_agent_messages[i] = len(agent_messages) > 0
+    
+    # Stable integer code per contact drives agent assignment (hash() is salted per process)
+    contact_codes, _ = pd.factorize(contact_ids)
+    agent_ids = np.asarray(AGENT_IDS, dtype=object)[contact_codes % len(AGENT_IDS)]
+    agent_names = pd.Categorical.from_codes(contact_codes % len(AGENTS), categories=AGENTS)
+    
+    # Parse dates column-wise, once per conversation rather than per message;
+    # the export is always ISO 8601, so skip per-call format inference
+    start_dates = pd.to_datetime(start_dates, format='ISO8601')
+    end_dates = pd.to_datetime(end_dates, format='ISO8601')
+    durations = ((end_dates - start_dates).total_seconds() / 60).to_numpy(dtype=np.float32)
     
-    return pd.DataFrame(conversations)
+    # Draw all simulated randomness in batched NumPy calls
+    rng = np.random.default_rng(seed)
+    
+    # Empathy score (0 to 1) - based on agent responses
+    # (bounded scores are stored as float32 to halve their footprint)
+    empathy_scores = np.where(
+        has_agent_messages, rng.uniform(0.6, 1.0, n_conversations), 0.5
+    ).astype(np.float32)
+    outcome_confidences = rng.uniform(0.7, 0.95, n_conversations).astype(np.float32)
+    
+    # Score topic, sentiment and outcome across all conversations in one vectorized pass
+    primary_topics, sentiment_scores, outcomes = _score_conversations(
+        conversation_texts, rng, max_workers
+    )
+    
+    return pd.DataFrame({
+        'conversation_id': contact_ids,
+        'contact_id': contact_ids,
+        'start_date': start_dates,
+        'end_date': end_dates,
+        'duration_minutes': durations,
+        'agent_id': agent_ids,
+        'agent_name': agent_names,
+        'customer_id': customer_ids,
+        'outcome': outcomes,
+        'outcome_confidence': outcome_confidences,
+        'primary_topic': primary_topics,
+        'secondary_topics': _sample_secondary_topics(primary_topics, rng),
+        'sentiment_score': sentiment_scores.astype(np.float32),
+        'empathy_score': empathy_scores,
+        'message_count': message_counts,
+        'resolution_time_minutes': durations
+    }, index=pd.RangeIndex(n_conversations), copy=False)
 
 def generate_daily_aggregations(conversations_df):
     """Generate daily aggregation data"""
-    daily_data = []
     
     # Group by date
     conversations_df['date'] = conversations_df['start_date'].dt.date
+    grouped = conversations_df.assign(
+        successful=conversations_df['outcome'].eq('successful')
+    ).groupby('date', sort=False)
     
-    for date in conversations_df['date'].unique():
-        daily_convs = conversations_df[conversations_df['date'] == date]
-        
-        daily_record = {
-            'date': date,
-            'total_conversations': len(daily_convs),
-            'successful_conversations': len(daily_convs[daily_convs['outcome'] == 'successful']),
-            'avg_sentiment': daily_convs['sentiment_score'].mean(),
-            'avg_empathy': daily_convs['empathy_score'].mean(),
-            'top_topics': daily_convs['primary_topic'].value_counts().head(3).index.tolist(),
-            'avg_duration': daily_convs['duration_minutes'].mean()
-        }
-        
-        daily_data.append(daily_record)
+    daily_df = grouped.agg(
+        total_conversations=('outcome', 'size'),
+        successful_conversations=('successful', 'sum'),
+        avg_sentiment=('sentiment_score', 'mean'),
+        avg_empathy=('empathy_score', 'mean'),
+        avg_duration=('duration_minutes', 'mean')
+    )
+    
+    # Top 3 topics per day from a single value_counts over all groups
+    topic_counts = grouped['primary_topic'].value_counts()
+    topic_counts = topic_counts[topic_counts > 0]
+    top_topics = topic_counts.groupby(level=0, sort=False).head(3).reset_index()
+    daily_df['top_topics'] = top_topics.groupby('date', sort=False)['primary_topic'].agg(list)
     
-    return pd.DataFrame(daily_data)
+    daily_df = daily_df.reset_index()
+    return daily_df[['date', 'total_conversations', 'successful_conversations', 'avg_sentiment',
+                     'avg_empathy', 'top_topics', 'avg_duration']]
 
 if __name__ == "__main__":
     # Process the data
     conversations_df = load_and_process_chat_data('data/customer_service_chats.json')
     daily_df = generate_daily_aggregations(conversations_df)
     
-    # Save processed data
-    conversations_df.to_csv('data/processed_conversations.csv', index=False)
-    daily_df.to_csv('data/daily_aggregations.csv', index=False)
+    # Save processed data (written in chunks to bound the formatting buffer)
+    conversations_df.to_csv('data/processed_conversations.csv', index=False, chunksize=10_000)
+    daily_df.to_csv('data/daily_aggregations.csv', index=False, chunksize=10_000)
     
     print(f"Processed {len(conversations_df)} conversations")
     print(f"Generated {len(daily_df)} daily aggregation records")
\ No newline at end of file
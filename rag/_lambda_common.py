@@ -0,0 +1,49 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Warm-container cache of completions shared by the agent handlers; entries
+# expire after _CACHE_TTL seconds. Bundle this module alongside each handler.
+_CACHE_MAX_ENTRIES = 256
+_CACHE_TTL = 300
+_response_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _cache_key(*parts):
+    """Compact key for a tuple of strings, e.g. an (agent, prompt) pair"""
+    return hashlib.blake2b('\x00'.join(map(str, parts)).encode('utf-8'), digest_size=16).digest()
+
+def _cache_get(key):
+    """Cached value for key, or None if missing or stale"""
+    with _cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > _CACHE_TTL:
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return value
+
+def _cache_put(key, value):
+    """Store a value, evicting the least recently used entry when full"""
+    with _cache_lock:
+        _response_cache[key] = (time.monotonic(), value)
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > _CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+
+def _iter_completion(response):
+    """
+    Yield the raw completion bytes of an invoke_agent response as they arrive.
+
+    The managed Python runtime cannot stream a Lambda response, so handlers
+    still collect the chunks, but anything fronted by a streaming adapter can
+    forward this generator directly instead of waiting for the full answer.
+    """
+    for event_chunk in response.get('completion', ()):
+        chunk = event_chunk.get('chunk')
+        if chunk and 'bytes' in chunk:
+            yield chunk['bytes']
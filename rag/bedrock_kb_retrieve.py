@@ -1,6 +1,75 @@
 import boto3
 import os
 import json
+import copy
+import functools
+import asyncio
+from _lambda_common import _cache_key, _cache_get, _cache_put
+
+@functools.lru_cache(maxsize=4)
+def _client(region):
+    """Bedrock Agent Runtime client, created once per region"""
+    return boto3.client('bedrock-agent-runtime', region_name=region)
+
+def _cached_call(key, call):
+    """
+    Serve call() from the shared TTL cache, so results are refreshed after
+    a Knowledge Base re-sync; callers get their own copy of the response
+    (errors propagate and are not cached)
+    """
+    response = _cache_get(key)
+    if response is None:
+        response = call()
+        _cache_put(key, response)
+    return copy.deepcopy(response)
+
+def _cached_retrieve(query, knowledge_base_id, region):
+    """Cached Knowledge Base retrieve call"""
+    key = _cache_key('retrieve', knowledge_base_id, region, query)
+    return _cached_call(key, functools.partial(_retrieve, query, knowledge_base_id, region))
+
+def _cached_retrieve_and_generate(query, knowledge_base_id, model_arn, region):
+    """Cached Knowledge Base retrieve-and-generate call"""
+    key = _cache_key('retrieve_and_generate', knowledge_base_id, model_arn, region, query)
+    return _cached_call(key, functools.partial(_retrieve_and_generate, query, knowledge_base_id, model_arn, region))
+
+def _retrieve(query, knowledge_base_id, region):
+    """Knowledge Base retrieve call"""
+    client = _client(region)
+    
+    return client.retrieve(
+        knowledgeBaseId=knowledge_base_id,
+        retrievalQuery={
+            'text': query
+        },
+        retrievalConfiguration={
+            'vectorSearchConfiguration': {
+                'numberOfResults': 5  # Number of results to return
+            }
+        }
+    )
+
+def _retrieve_and_generate(query, knowledge_base_id, model_arn, region):
+    """Knowledge Base retrieve-and-generate call"""
+    client = _client(region)
+    
+    return client.retrieve_and_generate(
+        input={
+            'text': query
+        },
+        retrieveAndGenerateConfiguration={
+            'type': 'KNOWLEDGE_BASE',
+            'knowledgeBaseConfiguration': {
+                'knowledgeBaseId': knowledge_base_id,
+                'modelArn': model_arn,
+                'retrievalConfiguration': {
+                    'vectorSearchConfiguration': {
+                        'numberOfResults': 5
+                    }
+                }
+            }
+        }
+    )
 
 def retrieve_from_knowledge_base(query, knowledge_base_id, region='us-east-1'):
     """
@@ -15,22 +84,9 @@ def retrieve_from_knowledge_base(query, knowledge_base_id, region='us-east-1'):
         dict: Retrieved results
     """
     
-    # Initialize Bedrock Agent Runtime client
-    client = boto3.client('bedrock-agent-runtime', region_name=region)
-    
     try:
-        # Call the retrieve API
-        response = client.retrieve(
-            knowledgeBaseId=knowledge_base_id,
-            retrievalQuery={
-                'text': query
-            },
-            retrievalConfiguration={
-                'vectorSearchConfiguration': {
-                    'numberOfResults': 5  # Number of results to return
-                }
-            }
-        )
+        # Repeated queries are served from the in-process TTL cache
+        response = _cached_retrieve(query, knowledge_base_id, region)
         
         return response
         
@@ -38,6 +94,30 @@ def retrieve_from_knowledge_base(query, knowledge_base_id, region='us-east-1'):
         print(f"Error retrieving from knowledge base: {e}")
         return None
 
+async def retrieve_batch_from_knowledge_base(queries, knowledge_base_id, region='us-east-1',
+                                             max_concurrency=8):
+    """
+    Retrieve results for several queries concurrently
+    
+    Args:
+        queries (list): The search queries
+        knowledge_base_id (str): Your Knowledge Base ID
+        region (str): AWS region
+        max_concurrency (int): Maximum number of in-flight retrieve calls
+    
+    Returns:
+        list: Retrieved results in query order (None for failed queries)
+    """
+    
+    # boto3 calls block, so run each one in a worker thread and bound the fan-out
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def _retrieve(query):
+        async with semaphore:
+            return await asyncio.to_thread(retrieve_from_knowledge_base, query, knowledge_base_id, region)
+    
+    return await asyncio.gather(*(_retrieve(query) for query in queries))
+
 def retrieve_and_generate(query, knowledge_base_id, model_arn, region='us-east-1'):
     """
     Retrieve from Knowledge Base and generate response using a model
@@ -52,26 +132,9 @@ def retrieve_and_generate(query, knowledge_base_id, model_arn, region='us-east-1
         dict: Generated response with citations
     """
     
-    client = boto3.client('bedrock-agent-runtime', region_name=region)
-    
     try:
-        response = client.retrieve_and_generate(
-            input={
-                'text': query
-            },
-            retrieveAndGenerateConfiguration={
-                'type': 'KNOWLEDGE_BASE',
-                'knowledgeBaseConfiguration': {
-                    'knowledgeBaseId': knowledge_base_id,
-                    'modelArn': model_arn,
-                    'retrievalConfiguration': {
-                        'vectorSearchConfiguration': {
-                            'numberOfResults': 5
-                        }
-                    }
-                }
-            }
-        )
+        # Repeated queries are served from the in-process TTL cache
+        response = _cached_retrieve_and_generate(query, knowledge_base_id, model_arn, region)
         
         return response
         
@@ -1,11 +1,60 @@
 import boto3
 import json
 import uuid
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
+from botocore.config import Config
+from boto3.s3.transfer import TransferConfig
+from _lambda_common import _cache_key, _cache_get, _cache_put, _iter_completion
 
-# Initialize clients
+# Prefer orjson for (de)serialization when it is bundled with the function
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_bytes(obj, indent=False):
+    """Serialize to UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, default=str, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def _json_str(obj, indent=False):
+    """Serialize to a JSON string (API Gateway bodies must be str)"""
+    return _json_bytes(obj, indent).decode('utf-8')
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Initialize clients (one S3 client shared by all upload threads)
 bedrock_agent_runtime = boto3.client('bedrock-agent-runtime')
-s3_client = boto3.client('s3')
+s3_client = boto3.client('s3', config=Config(max_pool_connections=50))
+
+# S3 archive writes run off the response path; the handler waits at most
+# _S3_DRAIN_SECONDS for them. A write still running then is frozen with the
+# container and may be lost (reported as s3_status "pending")
+_S3_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+_S3_DRAIN_SECONDS = 0.2
+
+# Bodies at or above the threshold go through a parallel multipart upload
+_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=_MULTIPART_THRESHOLD,
+    max_concurrency=10,
+    use_threads=True
+)
+
+def _put_json(bucket, key, body):
+    """Upload a JSON body, switching to multipart for large payloads"""
+    if len(body) < _MULTIPART_THRESHOLD:
+        return s3_client.put_object(Bucket=bucket, Key=key, Body=body, ContentType='application/json')
+    return s3_client.upload_fileobj(
+        io.BytesIO(body), bucket, key,
+        ExtraArgs={'ContentType': 'application/json'},
+        Config=_TRANSFER_CONFIG
+    )
 
 # Configuration
 agent_id = 'OWEMRO6IAT'
@@ -13,23 +62,44 @@ agent_alias_id = 'TSTALIASID'
 s3_bucket = 'lucky8bucket'  # Replace with your actual bucket name
 user_input = 'Run instruction for all contact_ids found. If multiple conversations are found, return all details from them.'
 
+# invoke_agent with the fixed agent/alias bound once per container
+_invoke_agent = functools.partial(
+    bedrock_agent_runtime.invoke_agent,
+    agentId=agent_id,
+    agentAliasId=agent_alias_id
+)
+
+# Response headers shared by every return branch
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+def _is_warmup(event):
+    """True for scheduled keep-warm pings ({"ping": true} or EventBridge events)"""
+    return event.get('source') == 'aws.events' or bool(event.get('ping'))
+
 def lambda_handler(event, context):
+    # Keep-warm pings return before any parsing or Bedrock call
+    if _is_warmup(event):
+        return {'statusCode': 200, 'headers': _CORS_HEADERS, 'body': '{"pong": true}'}
+    
     try:
-        print(f'Raw event: {json.dumps(event, default=str)}')
+        print(f'Raw event: {_json_str(event)}')
         
         # Handle different event sources
         if 'body' in event:
             if event['body'] is None:
                 body = {}
             elif isinstance(event['body'], str):
-                body = json.loads(event['body']) if event['body'] else {}
+                body = _json_loads(event['body']) if event['body'] else {}
             else:
                 body = event['body']
         else:
             # Direct Lambda invoke
             body = event
         
-        print(f'Parsed body: {json.dumps(body, default=str)}')
+        print(f'Parsed body: {_json_str(body)}')
         
         # Extract input with fallbacks and validation
         user_input = (
@@ -47,41 +117,43 @@ def lambda_handler(event, context):
         if not user_input:
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
+                'headers': _CORS_HEADERS,
+                'body': _json_str({
                     'error': 'Missing required parameter',
                     'message': 'inputText cannot be empty. Please provide input in one of: input, inputText, message, or query',
                     'received_body': body
                 })
             }
         
-        # Invoke the agent with proper parameter name
-        response = bedrock_agent_runtime.invoke_agent(
-            agentId=agent_id,
-            agentAliasId=agent_alias_id,
-            sessionId=session_id,
-            inputText=user_input  # Fixed variable name
-        )
-        
-        print(f'Bedrock response received: {type(response)}')
+        # Serve repeated prompts from the warm-container cache when asked to
+        cache_key = _cache_key(agent_id, user_input) if body.get('cache', False) else None
+        full_response = _cache_get(cache_key) if cache_key else None
         
-        # Process the streaming response
-        full_response = ""
-        if 'completion' in response:
-            for event_chunk in response['completion']:
-                if 'chunk' in event_chunk:
-                    chunk = event_chunk['chunk']
-                    if 'bytes' in chunk:
-                        full_response += chunk['bytes'].decode('utf-8')
+        if full_response is None:
+            # Invoke the agent with proper parameter name
+            response = _invoke_agent(
+                sessionId=session_id,
+                inputText=user_input  # Fixed variable name
+            )
+            
+            print(f'Bedrock response received: {type(response)}')
+            
+            # Process the streaming response
+            full_response = b''.join(_iter_completion(response)).decode('utf-8')
+            
+            if cache_key:
+                _cache_put(cache_key, full_response)
+        else:
+            print('Serving cached agent response')
         
         print(f'Full response: {full_response}')
         
+        # One clock read shared by the response timestamp and the S3 key
+        now = datetime.now()
+        
         # Create response data
         response_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "agent_id": agent_id,
             "session_id": session_id,
             "input": user_input,
@@ -90,42 +162,45 @@ def lambda_handler(event, context):
         }
         
         # Generate S3 key
-        timestamp = datetime.now().strftime('%Y/%m/%d/%H%M%S')
-        s3_key = f"agent-responses/{timestamp}-{session_id[:8]}.json"
+        s3_key = (
+            f"agent-responses/{now.year:04d}/{now.month:02d}/{now.day:02d}/"
+            f"{now.hour:02d}{now.minute:02d}{now.second:02d}-{session_id[:8]}.json"
+        )
         
-        # Save to S3 (optional - comment out if not needed)
+        # Save to S3 in the background (optional - comment out if not needed)
+        upload = _S3_EXECUTOR.submit(_put_json, s3_bucket, s3_key, _json_bytes(response_data, indent=True))
+        wait_seconds = _S3_DRAIN_SECONDS
+        if context is not None:
+            wait_seconds = min(wait_seconds, max(0.0, context.get_remaining_time_in_millis() / 1000 - 1))
+        response_data['s3_location'] = None
         try:
-            s3_client.put_object(
-                Bucket=s3_bucket,
-                Key=s3_key,
-                Body=json.dumps(response_data, indent=2, ensure_ascii=False),
-                ContentType='application/json'
-            )
+            upload.result(timeout=wait_seconds)
             print(f"Response saved to S3: s3://{s3_bucket}/{s3_key}")
             response_data['s3_location'] = f"s3://{s3_bucket}/{s3_key}"
+            response_data['s3_status'] = 'saved'
+        except FutureTimeoutError:
+            # Lambda freezes the container after returning, so this save
+            # may never complete
+            print(f"S3 save still in progress, may be lost: s3://{s3_bucket}/{s3_key}")
+            response_data['s3_status'] = 'pending'
         except Exception as s3_error:
             print(f"S3 save error (non-critical): {s3_error}")
             # Don't fail the whole function for S3 errors
+            response_data['s3_status'] = 'failed'
         
         # Return proper API Gateway response
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps(response_data)
+            'headers': _CORS_HEADERS,
+            'body': _json_str(response_data)
         }
         
     except json.JSONDecodeError as e:
         print(f"JSON parsing error: {e}")
         return {
             'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': _CORS_HEADERS,
+            'body': _json_str({
                 'error': 'Invalid JSON in request body',
                 'details': str(e)
             })
@@ -138,11 +213,8 @@ def lambda_handler(event, context):
         
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': _CORS_HEADERS,
+            'body': _json_str({
                 'error': 'Internal server error',
                 'details': str(e),
                 'timestamp': datetime.now().isoformat()
@@ -1,43 +1,132 @@
-
 import json
 import boto3
 import uuid
+import functools
 import os
+from _lambda_common import _cache_key, _cache_get, _cache_put, _iter_completion
+
+# Prefer orjson for (de)serialization when it is bundled with the function
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_str(obj):
+    """Serialize to a JSON string (API Gateway bodies must be str)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str).decode('utf-8')
+    return json.dumps(obj, default=str)
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Decode request bodies straight into a typed struct when msgspec is bundled
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+if MSGSPEC_AVAILABLE:
+    class AgentRequest(msgspec.Struct):
+        """Expected shape of the API Gateway request body"""
+        input: str = ''
+        sessionId: str | None = None
+        cache: bool = False
+
+    _decode_request = msgspec.json.Decoder(AgentRequest).decode
+
+# Types accepted for each field when msgspec is not bundled, matching the
+# AgentRequest struct so both paths reject the same bodies
+_REQUEST_FIELD_TYPES = {
+    'input': (str,),
+    'sessionId': (str, type(None)),
+    'cache': (bool,)
+}
+
+def _parse_request(raw_body):
+    """
+    Return (user_input, session_id, use_cache) from a JSON request body,
+    raising ValueError for a missing, malformed or mistyped body
+    """
+    if raw_body is None:
+        raise ValueError('Missing request body')
+    if MSGSPEC_AVAILABLE:
+        request = _decode_request(raw_body)
+        user_input, session_id, use_cache = request.input, request.sessionId, request.cache
+    else:
+        body = _json_loads(raw_body)
+        if not isinstance(body, dict):
+            raise ValueError('Expected `object`')
+        for field, types in _REQUEST_FIELD_TYPES.items():
+            if field in body and not isinstance(body[field], types):
+                raise ValueError(f"Invalid type for `$.{field}`")
+        user_input, session_id, use_cache = body.get('input', ''), body.get('sessionId'), body.get('cache', False)
+    if session_id is None:
+        session_id = str(uuid.uuid4())
+    return user_input, session_id, use_cache
 
 bedrock_agent_runtime = boto3.client('bedrock-agent-runtime')
 AGENT_ID = 'Q8IKVKON2G'
 AGENT_ALIAS_ID = 'AZARIFKC2W'
 
+# invoke_agent with the fixed agent/alias bound once per container
+_invoke_agent = functools.partial(
+    bedrock_agent_runtime.invoke_agent,
+    agentId=AGENT_ID,
+    agentAliasId=AGENT_ALIAS_ID
+)
+
+# Response headers shared by every return branch
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+def _is_warmup(event):
+    """True for scheduled keep-warm pings ({"ping": true} or EventBridge events)"""
+    return event.get('source') == 'aws.events' or bool(event.get('ping'))
+
 def lambda_handler(event, context):
+    # Keep-warm pings return before any parsing or Bedrock call
+    if _is_warmup(event):
+        return {'statusCode': 200, 'headers': _CORS_HEADERS, 'body': '{"pong": true}'}
+    
     try:
         # Parse the request body
-        body_obj = event.get('body')
-        body = json.loads(body_obj)
-        user_input = body.get('input', '')
-        session_id = body.get('sessionId', str(uuid.uuid4()))
+        try:
+            user_input, session_id, use_cache = _parse_request(event.get('body'))
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': _CORS_HEADERS,
+                'body': _json_str({
+                    'error': 'Invalid request body',
+                    'details': str(e)
+                })
+            }
         
-        # Invoke the Bedrock agent
-        response = bedrock_agent_runtime.invoke_agent(
-            agentId=AGENT_ID,
-            agentAliasId=AGENT_ALIAS_ID,
-            sessionId=session_id,
-            inputText=user_input
-        )
+        # Serve repeated prompts from the warm-container cache when asked to
+        cache_key = _cache_key(AGENT_ID, user_input) if use_cache else None
+        completion = _cache_get(cache_key) if cache_key else None
         
-        # Process the response
-        completion = ""
-        for event in response.get('completion'):
-            chunk = event.get('chunk')
-            if chunk:
-                completion += chunk.get('bytes').decode()
+        if completion is None:
+            # Invoke the Bedrock agent
+            response = _invoke_agent(
+                sessionId=session_id,
+                inputText=user_input
+            )
+            
+            # Process the response
+            completion = b''.join(_iter_completion(response)).decode()
+            
+            if cache_key:
+                _cache_put(cache_key, completion)
         
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': _CORS_HEADERS,
+            'body': _json_str({
                 'response': completion,
                 'sessionId': session_id
             })
@@ -46,11 +135,8 @@ def lambda_handler(event, context):
     except Exception as e:
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': _CORS_HEADERS,
+            'body': _json_str({
                 'error': str(e)
             })
         }
\ No newline at end of file
@@ -7,8 +7,16 @@ Run this script to start the Streamlit dashboard locally.
 import subprocess
 import sys
 import os
+import shutil
+import importlib.util
 from pathlib import Path
 
+def _install_command(packages):
+    """Prefer uv's resolver when it is on PATH, otherwise fall back to pip"""
+    if shutil.which("uv"):
+        return ["uv", "pip", "install", "--python", sys.executable] + packages
+    return [sys.executable, "-m", "pip", "install"] + packages
+
 def check_dependencies():
     """Check if required packages are installed"""
     required_packages = [
@@ -16,13 +24,12 @@ def check_dependencies():
         'wordcloud', 'seaborn', 'matplotlib'
     ]
     
-    missing_packages = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    # The dashboard runs in its own Streamlit process, so only check that each
+    # package can be found instead of importing (and executing) it here
+    missing_packages = [
+        package for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
     
     if missing_packages:
         print("❌ Missing required packages:")
@@ -31,9 +38,7 @@ def check_dependencies():
         print("\n🔧 Installing missing packages...")
         
         try:
-            subprocess.check_call([
-                sys.executable, "-m", "pip", "install"
-            ] + missing_packages)
+            subprocess.check_call(_install_command(missing_packages))
             print("✅ All packages installed successfully!")
         except subprocess.CalledProcessError:
             print("❌ Failed to install packages. Please install manually:")
@@ -3,13 +3,15 @@ S3 Handler for Call Center Data Management
 """
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 import json
 import pandas as pd
 from datetime import datetime, timedelta
 import os
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Union, Tuple, Set
 import logging
 from botocore.exceptions import ClientError
+from botocore.config import Config
 import io
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import mimetypes
@@ -17,10 +19,66 @@ import tempfile
 from pathlib import Path
 import threading
 import hashlib
+import functools
+import time
+
+# Prefer orjson for object bodies when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+# Where each kind of call data lives, keyed by its field in get_call_data
+_CALL_DATA_PREFIXES = {
+    'recording': 'call-recordings/',
+    'transcript': 'transcripts/',
+    'analytics': 'analytics/'
+}
+
+# Per-call, per-field pointer objects ({"key": ...}) naming the exact object
+# for each kind of call data, so lookups need no prefix scan
+_INDEX_PREFIX = 'index/'
+
+# Bodies at or above the threshold go through a parallel multipart upload
+_MULTIPART_THRESHOLD = 5 * 1024 * 1024
+_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
+# Days either side of a date hint to scan, covering uploads that landed in
+# a neighbouring date partition around midnight
+_DATE_HINT_WINDOW_DAYS = 1
+
+# Keys per ListObjectsV2 page (the service maximum)
+_LIST_PAGE_SIZE = 1000
+
+# Prefix listings are reused for up to this long; writes through the
+# handler clear them immediately
+_LIST_CACHE_SECONDS = 60
+_LIST_CACHE_SIZE = 1024
+
+# Presigned URLs are reused within windows of up to this length and signed
+# for that much longer, so every URL handed out lasts at least the requested
+# time and at most this much longer; SigV4 caps the signed lifetime
+_PRESIGNED_URL_REUSE_SECONDS = 300
+_PRESIGNED_URL_MAX_SECONDS = 7 * 24 * 3600
+_PRESIGNED_URL_CACHE_SIZE = 1024
+
+# delete_objects accepts at most this many keys per request
+_DELETE_BATCH_SIZE = 1000
+
 class S3CallCenterHandler:
     """
     Comprehensive S3 handler for call center data operations
@@ -42,14 +100,36 @@ class S3CallCenterHandler:
         self.region_name = region_name
         self.max_workers = max_workers
         
-        # Initialize S3 clients
-        self.s3_client = boto3.client('s3', region_name=region_name)
-        self.s3_resource = boto3.resource('s3', region_name=region_name)
+        # Initialize S3 clients; the pool leaves room for the worker threads
+        # and the multipart transfer threads at once, and keepalive holds
+        # pooled connections open between requests
+        config = Config(
+            max_pool_connections=max(max_workers * 2, 50),
+            retries={'max_attempts': 5, 'mode': 'adaptive'},
+            tcp_keepalive=True,
+            s3={'addressing_style': 'virtual'}
+        )
+        self.s3_client = boto3.client('s3', region_name=region_name, config=config)
+        self.s3_resource = boto3.resource('s3', region_name=region_name, config=config)
         self.bucket = self.s3_resource.Bucket(bucket_name)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=_MULTIPART_THRESHOLD,
+            multipart_chunksize=_MULTIPART_CHUNKSIZE,
+            max_concurrency=max_workers,
+            use_threads=True
+        )
         
         # Thread lock for concurrent operations
         self.lock = threading.Lock()
         
+        # Per-handler caches for prefix listings and presigned URLs
+        self._cached_listing = functools.lru_cache(maxsize=_LIST_CACHE_SIZE)(
+            self._list_call_objects
+        )
+        self._cached_presigned_url = functools.lru_cache(
+            maxsize=_PRESIGNED_URL_CACHE_SIZE
+        )(self._sign_url)
+        
         # Verify bucket exists
         self._verify_bucket()
         
@@ -84,13 +164,15 @@ class S3CallCenterHandler:
             Upload details
         """
         try:
-            timestamp = datetime.now().strftime('%Y/%m/%d')
+            now = datetime.now()
+            timestamp = now.strftime('%Y/%m/%d')
+            uploaded_at = now.isoformat()
             
             if format == 'json':
                 if isinstance(transcript, str):
-                    content = json.dumps({'transcript': transcript}, indent=2)
+                    body = _json_dumps({'transcript': transcript})
                 else:
-                    content = json.dumps(transcript, indent=2)
+                    body = _json_dumps(transcript)
                 s3_key = f"transcripts/{timestamp}/{call_id}_transcript.json"
                 content_type = 'application/json'
                 
@@ -98,28 +180,27 @@ class S3CallCenterHandler:
                 raise ValueError(f"Unsupported format: {format}")
             
             # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=content.encode('utf-8'),
+            self._put_body(
+                s3_key,
+                body,
                 ContentType=content_type,
                 Metadata={
                     'call-id': call_id,
-                    'upload-timestamp': datetime.now().isoformat(),
+                    'upload-timestamp': uploaded_at,
                     'format': format
-                },
-                ServerSideEncryption='AES256'
+                }
             )
             
             logger.info(f"Uploaded transcript for {call_id} to {s3_key}")
+            self._set_call_pointer(call_id, 'transcript', s3_key)
             
             return {
                 'success': True,
                 'call_id': call_id,
                 's3_key': s3_key,
                 'format': format,
-                'size_bytes': len(content.encode('utf-8')),
-                'uploaded_at': datetime.now().isoformat()
+                'size_bytes': len(body),
+                'uploaded_at': uploaded_at
             }
             
         except Exception as e:
@@ -144,36 +225,37 @@ class S3CallCenterHandler:
             Upload details
         """
         try:
-            timestamp = datetime.now().strftime('%Y/%m/%d')
+            now = datetime.now()
+            timestamp = now.strftime('%Y/%m/%d')
+            uploaded_at = now.isoformat()
             s3_key = f"analytics/{timestamp}/{call_id}_enrich.json"
             
             # Add metadata to analytics
             analytics_data['_metadata'] = {
                 'call_id': call_id,
-                'processed_at': datetime.now().isoformat(),
+                'processed_at': uploaded_at,
                 'version': '1.0'
             }
             
             # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=json.dumps(analytics_data, indent=2),
+            self._put_body(
+                s3_key,
+                _json_dumps(analytics_data),
                 ContentType='application/json',
                 Metadata={
                     'call-id': call_id,
-                    'analytics-timestamp': datetime.now().isoformat()
-                },
-                ServerSideEncryption='AES256'
+                    'analytics-timestamp': uploaded_at
+                }
             )
             
             logger.info(f"Uploaded analytics for {call_id} to {s3_key}")
+            self._set_call_pointer(call_id, 'analytics', s3_key)
             
             return {
                 'success': True,
                 'call_id': call_id,
                 's3_key': s3_key,
-                'uploaded_at': datetime.now().isoformat()
+                'uploaded_at': uploaded_at
             }
             
         except Exception as e:
@@ -184,12 +266,45 @@ class S3CallCenterHandler:
                 'call_id': call_id
             }
     
-    def get_call_data(self, call_id: str) -> Dict[str, Any]:
+    def _put_body(self, s3_key: str, body: bytes, **extra_args):
+        """
+        Upload an encrypted body, switching to a concurrent multipart
+        upload for large payloads
+        
+        Args:
+            s3_key: S3 object key
+            body: Object content
+            **extra_args: ContentType, Metadata and other put arguments
+        """
+        extra_args['ServerSideEncryption'] = 'AES256'
+        self._cached_listing.cache_clear()
+        
+        if len(body) < _MULTIPART_THRESHOLD:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Body=body,
+                **extra_args
+            )
+        else:
+            self.s3_client.upload_fileobj(
+                io.BytesIO(body),
+                self.bucket_name,
+                s3_key,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config
+            )
+    
+    def get_call_data(self,
+                      call_id: str,
+                      date_hint: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Retrieve all data for a specific call
         
         Args:
             call_id: Call identifier
+            date_hint: Approximate upload date; when given, fallback scans
+                only list the date partitions around it
             
         Returns:
             Dictionary with all call data
@@ -202,54 +317,48 @@ class S3CallCenterHandler:
                 'analytics': None
             }
             
-            # Search for files related to this call
-            prefixes = [
-                'call-recordings/',
-                'transcripts/',
-                'analytics/'
-            ]
-            
-            for prefix in prefixes:
-                paginator = self.s3_client.get_paginator('list_objects_v2')
-                pages = paginator.paginate(
-                    Bucket=self.bucket_name,
-                    Prefix=prefix
-                )
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Follow the call's pointers, scanning only for fields that
+                # have none or whose object has gone
+                pointers = dict(zip(
+                    _CALL_DATA_PREFIXES,
+                    executor.map(lambda field: self._get_call_pointer(call_id, field), _CALL_DATA_PREFIXES)
+                ))
+                futures = {
+                    executor.submit(self._fetch_call_object, field, key): field
+                    for field, key in pointers.items()
+                    if key
+                }
+                
+                missing = {field for field, key in pointers.items() if not key}
+                for future in as_completed(futures):
+                    try:
+                        call_data[futures[future]] = future.result()
+                    except ClientError as e:
+                        if not self._is_missing_key(e):
+                            raise
+                        missing.add(futures[future])
                 
-                for page in pages:
-                    if 'Contents' not in page:
-                        continue
+                if missing:
+                    covered = set(_CALL_DATA_PREFIXES) - missing
+                    downloads = self._collect_call_objects(
+                        self._scan_call_objects(executor, call_id, covered, date_hint),
+                        call_data
+                    )
+                    if 'recording' in missing and call_data['recording']:
+                        downloads['recording'] = call_data['recording']['key']
                     
-                    for obj in page['Contents']:
-                        if call_id in obj['Key']:
-                            if 'call-recordings' in obj['Key']:
-                                call_data['recording'] = {
-                                    'key': obj['Key'],
-                                    'size': obj['Size'],
-                                    'last_modified': obj['LastModified']
-                                }
-                            elif 'transcripts' in obj['Key']:
-                                # Download transcript
-                                response = self.s3_client.get_object(
-                                    Bucket=self.bucket_name,
-                                    Key=obj['Key']
-                                )
-                                content = response['Body'].read().decode('utf-8')
-                                
-                                if obj['Key'].endswith('.json'):
-                                    call_data['transcript'] = json.loads(content)
-                                else:
-                                    call_data['transcript'] = content
-                                    
-                            elif 'analytics' in obj['Key']:
-                                # Download analytics
-                                response = self.s3_client.get_object(
-                                    Bucket=self.bucket_name,
-                                    Key=obj['Key']
-                                )
-                                call_data['analytics'] = json.loads(
-                                    response['Body'].read().decode('utf-8')
-                                )
+                    # Download scanned transcript and analytics concurrently,
+                    # and point the call at what the scan found
+                    futures = {
+                        executor.submit(self._read_object, key, field == 'analytics'): field
+                        for field, key in downloads.items()
+                        if field != 'recording'
+                    }
+                    for field, key in downloads.items():
+                        executor.submit(self._set_call_pointer, call_id, field, key)
+                    for future in as_completed(futures):
+                        call_data[futures[future]] = future.result()
             
             return call_data
             
@@ -257,6 +366,208 @@ class S3CallCenterHandler:
             logger.error(f"Error retrieving call data: {e}")
             raise
     
+    @staticmethod
+    def _collect_call_objects(objects: List[Dict[str, Any]],
+                              call_data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Record a scanned recording in call_data and pick the transcript and
+        analytics keys to download
+        
+        Args:
+            objects: Scanned objects in prefix order
+            call_data: Call data being assembled
+            
+        Returns:
+            Keys to download by call_data field (the last match wins)
+        """
+        downloads = {}
+        
+        for obj in objects:
+            if 'call-recordings' in obj['Key']:
+                call_data['recording'] = {
+                    'key': obj['Key'],
+                    'size': obj['Size'],
+                    'last_modified': obj['LastModified']
+                }
+            elif 'transcripts' in obj['Key']:
+                downloads['transcript'] = obj['Key']
+            elif 'analytics' in obj['Key']:
+                downloads['analytics'] = obj['Key']
+        
+        return downloads
+    
+    @staticmethod
+    def _is_missing_key(error: ClientError) -> bool:
+        """Whether a ClientError means the object does not exist"""
+        return error.response['Error']['Code'] in ('NoSuchKey', '404')
+    
+    def _fetch_call_object(self, field: str, s3_key: str) -> Any:
+        """Describe a recording, or download a transcript or analytics object"""
+        if field != 'recording':
+            return self._read_object(s3_key, field == 'analytics')
+        
+        response = self.s3_client.head_object(
+            Bucket=self.bucket_name,
+            Key=s3_key
+        )
+        return {
+            'key': s3_key,
+            'size': response['ContentLength'],
+            'last_modified': response['LastModified']
+        }
+    
+    @staticmethod
+    def _pointer_key(call_id: str, field: str) -> str:
+        """Key of the pointer object for one field of a call"""
+        return f"{_INDEX_PREFIX}{call_id}/{field}.json"
+    
+    def _get_call_pointer(self, call_id: str, field: str) -> Optional[str]:
+        """The key a call's pointer names for field, or None if it has none"""
+        try:
+            return self._read_object(self._pointer_key(call_id, field))['key']
+        except ClientError as e:
+            if self._is_missing_key(e):
+                return None
+            raise
+    
+    def _set_call_pointer(self, call_id: str, field: str, s3_key: str):
+        """Point a field of a call at s3_key (last writer wins)"""
+        try:
+            self._put_body(
+                self._pointer_key(call_id, field),
+                _json_dumps({'key': s3_key}),
+                ContentType='application/json'
+            )
+        except Exception as e:
+            # Lookups fall back to scanning, so a missing pointer only costs time
+            logger.warning(f"Error updating {field} pointer for {call_id}: {e}")
+    
+    def _scan_call_objects(self,
+                           executor: ThreadPoolExecutor,
+                           call_id: str,
+                           covered: Set[str],
+                           date_hint: Optional[datetime] = None,
+                           cached: bool = True) -> List[Dict[str, Any]]:
+        """
+        List the objects for a call under the prefix of every field not
+        already covered by a pointer, scanning the prefixes concurrently
+        
+        Args:
+            executor: Pool to run the listings on
+            call_id: Call identifier
+            covered: Fields to skip
+            date_hint: Approximate upload date to narrow the scan to
+            cached: Whether recent listings may be reused
+            
+        Returns:
+            Matching objects in prefix order
+        """
+        if cached:
+            list_objects = functools.partial(
+                self._cached_listing,
+                cache_window=int(time.time() // _LIST_CACHE_SECONDS)
+            )
+        else:
+            list_objects = self._list_call_objects
+        
+        listings = [
+            executor.submit(list_objects, prefix, call_id)
+            for field, root in _CALL_DATA_PREFIXES.items()
+            if field not in covered
+            for prefix in self._date_prefixes(root, date_hint)
+        ]
+        return [obj for listing in listings for obj in listing.result()]
+    
+    @staticmethod
+    def _date_prefixes(root: str, date_hint: Optional[datetime]) -> List[str]:
+        """Date partitions of root around date_hint, or root itself"""
+        if date_hint is None:
+            return [root]
+        
+        return [
+            f"{root}{(date_hint + timedelta(days=offset)).strftime('%Y/%m/%d')}/"
+            for offset in range(-_DATE_HINT_WINDOW_DAYS, _DATE_HINT_WINDOW_DAYS + 1)
+        ]
+    
+    def _list_call_objects(self,
+                           prefix: str,
+                           call_id: str,
+                           cache_window: Optional[int] = None) -> Tuple[Dict[str, Any], ...]:
+        """
+        List the objects under a prefix whose key mentions the call
+        
+        cache_window only takes part in the listing cache key, expiring
+        cached listings when the window rolls over
+        """
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=prefix,
+            PaginationConfig={'PageSize': _LIST_PAGE_SIZE}
+        )
+        
+        return tuple(
+            obj
+            for page in pages
+            for obj in page.get('Contents', [])
+            if call_id in obj['Key']
+        )
+    
+    def _read_object(self, s3_key: str, parse_json: bool = False) -> Any:
+        """Download an object, parsing it as JSON for .json keys"""
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name,
+            Key=s3_key
+        )
+        content = response['Body'].read()
+        
+        # Parse straight from bytes rather than decoding to str first
+        if parse_json or s3_key.endswith('.json'):
+            return _json_loads(content)
+        return content.decode('utf-8')
+    
+    def _delete_keys(self, keys: List[str]) -> List[str]:
+        """
+        Delete keys with batched delete_objects requests, sending the
+        batches concurrently when there is more than one
+        
+        Args:
+            keys: S3 object keys
+            
+        Returns:
+            The keys that were deleted
+        """
+        batches = [
+            keys[start:start + _DELETE_BATCH_SIZE]
+            for start in range(0, len(keys), _DELETE_BATCH_SIZE)
+        ]
+        
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self._delete_batch, batches))
+        else:
+            results = [self._delete_batch(batch) for batch in batches]
+        
+        return [key for deleted in results for key in deleted]
+    
+    def _delete_batch(self, batch: List[str]) -> List[str]:
+        """Delete up to _DELETE_BATCH_SIZE keys in one request"""
+        response = self.s3_client.delete_objects(
+            Bucket=self.bucket_name,
+            Delete={
+                'Objects': [{'Key': key} for key in batch],
+                'Quiet': True
+            }
+        )
+        
+        # Quiet mode only reports the keys that failed
+        failed = set()
+        for error in response.get('Errors', []):
+            failed.add(error['Key'])
+            logger.error(f"Error deleting {error['Key']}: {error.get('Message')}")
+        
+        return [key for key in batch if key not in failed]
+    
     def generate_presigned_url(self,
                              s3_key: str,
                              expiration: int = 3600) -> str:
@@ -271,15 +582,23 @@ class S3CallCenterHandler:
             Presigned URL
         """
         try:
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': self.bucket_name,
-                    'Key': s3_key
-                },
-                ExpiresIn=expiration
+            reuse_seconds = min(
+                _PRESIGNED_URL_REUSE_SECONDS,
+                _PRESIGNED_URL_MAX_SECONDS - expiration
             )
             
+            if expiration < _PRESIGNED_URL_REUSE_SECONDS or reuse_seconds <= 0:
+                # Too short-lived to stretch, or no room under the SigV4
+                # limit; sign a fresh URL for exactly the requested time
+                url = self._sign_url(s3_key, expiration)
+            else:
+                window = int(time.time() // reuse_seconds)
+                url = self._cached_presigned_url(
+                    s3_key,
+                    expiration + reuse_seconds,
+                    window
+                )
+            
             logger.info(f"Generated presigned URL for {s3_key}")
             return url
             
@@ -287,6 +606,22 @@ class S3CallCenterHandler:
             logger.error(f"Error generating presigned URL: {e}")
             raise
     
+    def _sign_url(self, s3_key: str, expires_in: int, window: Optional[int] = None) -> str:
+        """
+        Sign a get_object URL
+        
+        window only takes part in the presigned URL cache key, so a cached
+        URL is never served after its reuse window
+        """
+        return self.s3_client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': self.bucket_name,
+                'Key': s3_key
+            },
+            ExpiresIn=expires_in
+        )
+    
     def create_batch_upload_manifest(self,
                                    file_list: List[Dict[str, str]]) -> str:
         """
@@ -300,12 +635,13 @@ class S3CallCenterHandler:
         """
         try:
             manifest = []
+            timestamp = datetime.now().strftime('%Y/%m/%d')
             
             for file_info in file_list:
                 manifest.append({
                     'local_path': file_info['local_path'],
                     'call_id': file_info['call_id'],
-                    's3_key': f"call-recordings/{datetime.now().strftime('%Y/%m/%d')}/{file_info['call_id']}{Path(file_info['local_path']).suffix}"
+                    's3_key': f"call-recordings/{timestamp}/{file_info['call_id']}{Path(file_info['local_path']).suffix}"
                 })
             
             # Save manifest
@@ -321,42 +657,45 @@ class S3CallCenterHandler:
             raise
     
  
-    def delete_call_data(self, call_id: str) -> Dict[str, Any]:
+    def delete_call_data(self,
+                         call_id: str,
+                         date_hint: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Delete all data for a specific call
         
         Args:
             call_id: Call identifier
+            date_hint: Approximate upload date; when given, the scan
+                only lists the date partitions around it
             
         Returns:
             Deletion summary
         """
         try:
-            deleted_objects = []
-            
-            # Find all objects with this call_id
-            prefixes = ['call-recordings/', 'transcripts/', 'analytics/']
-            
-            for prefix in prefixes:
-                paginator = self.s3_client.get_paginator('list_objects_v2')
-                pages = paginator.paginate(
-                    Bucket=self.bucket_name,
-                    Prefix=prefix
+            # Always scan every prefix: pointers only name the latest object
+            # for each field
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pointers = executor.map(
+                    lambda field: (field, self._get_call_pointer(call_id, field)),
+                    _CALL_DATA_PREFIXES
                 )
+                keys = [
+                    obj['Key']
+                    for obj in self._scan_call_objects(
+                        executor, call_id, set(), date_hint, cached=False
+                    )
+                ]
                 
-                for page in pages:
-                    if 'Contents' not in page:
-                        continue
-                    
-                    for obj in page['Contents']:
-                        if call_id in obj['Key']:
-                            # Delete object
-                            self.s3_client.delete_object(
-                                Bucket=self.bucket_name,
-                                Key=obj['Key']
-                            )
-                            deleted_objects.append(obj['Key'])
-                            logger.info(f"Deleted {obj['Key']}")
+                # Also catch pointed-at keys outside a date_hint window, then
+                # the pointers themselves
+                for field, key in pointers:
+                    if key:
+                        keys.extend([key, self._pointer_key(call_id, field)])
+            
+            deleted_objects = self._delete_keys(list(dict.fromkeys(keys)))
+            self._cached_listing.cache_clear()
+            for key in deleted_objects:
+                logger.info(f"Deleted {key}")
             
             return {
                 'success': True,
@@ -6,32 +6,77 @@ This replaces the need for separate aws_agent, bedrock_client, and rag_handler
 import os
 import boto3
 import json
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator, Callable, Iterable, Iterator
 from botocore.exceptions import ClientError
+from botocore.config import Config
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import hashlib
-from collections import defaultdict
+import math
+import time
+from collections import defaultdict, OrderedDict
 import re
-import yaml
-from dotenv import load_dotenv
 import pickle
+import sqlite3
+from contextlib import closing
+import functools
+import importlib.util
+import weakref
+import threading
 
-# Try to import optional ML libraries
+# Prefer orjson for Bedrock request/response bodies when installed
 try:
-    from sentence_transformers import SentenceTransformer
-    import faiss
-    ML_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    ML_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Try to import optional streaming JSON parser
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Try to import optional multi-pattern matcher for the keyword tiers
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Check for optional ML libraries without importing them; sentence-transformers
+# pulls in torch, so the import is deferred until an agent actually needs it
+ML_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ('sentence_transformers', 'faiss')
+)
+if not ML_AVAILABLE:
     print("⚠️  ML libraries not available. Install with: pip install sentence-transformers faiss-cpu")
+SentenceTransformer = None
+faiss = None
+np = None
+
+def _import_ml_libraries():
+    """Import the embedding and vector-search libraries on first use"""
+    global SentenceTransformer, faiss, np
+    if faiss is None:
+        from sentence_transformers import SentenceTransformer
+        import faiss
+        import numpy as np
+
+def _maybe_load_env():
+    """Load .env for local runs; Lambda already injects the environment"""
+    if not os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+        from dotenv import load_dotenv
+        load_dotenv()
 
 # Load environment variables
-load_dotenv()
+_maybe_load_env()
 
 # Configure logging
 logging.basicConfig(
@@ -40,6 +85,276 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Default upper bound on concurrent blocking AWS calls (config: agent.io_threads);
+# client connection pools are sized to match so threads never queue for a socket
+_DEFAULT_IO_THREADS = 64
+
+@functools.lru_cache(maxsize=4)
+def _io_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Thread pool for blocking boto3 calls, shared by agents with the same size"""
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='aws-io')
+
+@functools.lru_cache(maxsize=4)
+def _load_config(config_path: str) -> Dict[str, Any]:
+    """Parse a YAML config file once, using LibYAML's loader when available"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(config_path, 'r') as file:
+        return yaml.load(file, Loader=loader)
+
+@functools.lru_cache(maxsize=16)
+def _aws_client(service: str, region: str, max_pool_connections: int = _DEFAULT_IO_THREADS):
+    """
+    boto3 client shared per (service, region) for the life of the process.
+
+    Building a client resolves endpoints and sets up the SSL context, so it is
+    done once at cold start and reused by every agent instance (and every warm
+    Lambda invocation). TCP keepalive holds pooled connections open between
+    bursts; a short connect timeout lets adaptive retries move on from a bad
+    endpoint quickly. New handlers should go through this helper instead of
+    calling boto3.client() per request.
+    """
+    config = Config(
+        max_pool_connections=max_pool_connections,
+        retries={'max_attempts': 5, 'mode': 'adaptive'},
+        tcp_keepalive=True,
+        connect_timeout=3,
+        read_timeout=60
+    )
+    return boto3.client(service, region_name=region, config=config)
+
+# Transcript characters embedded in Bedrock prompts / sent to Comprehend
+_PROMPT_TRANSCRIPT_CHARS = 3000
+_COMPREHEND_TEXT_CHARS = 5000
+
+# Documents per Comprehend batch_detect_sentiment request (service maximum)
+_COMPREHEND_BATCH_SIZE = 25
+
+# Stand-in for the prompt when pre-serializing the Bedrock request body
+_PROMPT_PLACEHOLDER = '__PROMPT__'
+
+# Static prompt text, built once at import; per-call prompts are a single
+# concatenation of head + conversation + tail
+_SUMMARY_PROMPT_HEAD = (
+    "Analyze this customer service conversation and provide a structured summary:\n\n"
+    "1. ISSUE: What was the customer's main problem or request?\n"
+    "2. RESOLUTION: How was the issue addressed?\n"
+    "3. OUTCOME: Was the issue resolved? Customer satisfaction level?\n"
+    "4. FOLLOW-UP: Any required follow-up actions?\n"
+    "5. KEY_POINTS: Important details or context\n\n"
+    "Conversation:\n"
+)
+_SUMMARY_PROMPT_TAIL = "\n\nSummary:\n"
+
+_SENTIMENT_PROMPT_HEAD = (
+    "Analyze the sentiment and emotional journey in this conversation:\n\n"
+    "1. CUSTOMER_SENTIMENT: Overall customer emotional state\n"
+    "2. SENTIMENT_PROGRESSION: How did emotions change during the call?\n"
+    "3. AGENT_EMPATHY: How well did the agent handle customer emotions?\n"
+    "4. EMOTIONAL_TRIGGERS: What caused emotional reactions?\n"
+    "5. SATISFACTION_LEVEL: Likely customer satisfaction (1-10)\n\n"
+    "Conversation:\n"
+)
+_SENTIMENT_PROMPT_TAIL = "\n\nSentiment Analysis:\n"
+
+_COMPLIANCE_PROMPT_HEAD = (
+    "Review this customer service conversation for compliance and quality:\n\n"
+    "Check for:\n"
+    "1. GREETING: Proper professional greeting\n"
+    "2. IDENTIFICATION: Agent identified themselves and company\n"
+    "3. VERIFICATION: Customer identity verification (if applicable)\n"
+    "4. INFORMATION_DISCLOSURE: Required disclosures made\n"
+    "5. PROFESSIONALISM: Professional language and tone maintained\n"
+    "6. RESOLUTION_PROCESS: Proper problem-solving approach\n"
+    "7. CLOSING: Appropriate conversation closing\n"
+    "8. VIOLATIONS: Any potential compliance issues\n\n"
+    "Rate each area as: EXCELLENT / GOOD / NEEDS_IMPROVEMENT / POOR\n\n"
+    "Conversation:\n"
+)
+_COMPLIANCE_PROMPT_TAIL = "\n\nCompliance Review:\n"
+
+_AGENT_RESPONSE_PROMPT_HEAD = (
+    "As a professional customer service agent, craft a helpful response to this customer.\n"
+    "Be empathetic, solution-focused, and professional.\n\n"
+    "Context:\n"
+)
+_AGENT_RESPONSE_PROMPT_TAIL = (
+    "\n\nProvide a clear, helpful response that:\n"
+    "1. Acknowledges the customer's concern\n"
+    "2. Offers a specific solution or next steps\n"
+    "3. Maintains a professional and empathetic tone\n\n"
+    "Agent Response:\n"
+)
+
+# Keyword tiers, checked in priority order; the first tier with any keyword
+# present (plain substring match on lower-cased text) wins
+ISSUE_CATEGORIES = {
+    'billing': ('bill', 'charge', 'payment', 'cost', 'fee'),
+    'technical': ('not working', 'broken', 'problem', 'error'),
+    'account': ('account', 'login', 'password', 'access'),
+    'service': ('cancel', 'upgrade', 'plan', 'change'),
+    'roaming': ('roaming', 'overseas', 'international'),
+    'data': ('data', 'internet', 'wifi', 'slow')
+}
+
+URGENCY_LEVELS = {
+    'critical': ('emergency', 'urgent', 'asap', 'immediately'),
+    'high': ('frustrated', 'angry', 'unacceptable'),
+    'medium': ('problem', 'issue', 'concerned')
+}
+
+def _compile_tiers(tiers: Dict[str, Tuple[str, ...]]) -> Tuple[Tuple[str, 're.Pattern'], ...]:
+    """One compiled alternation per tier, so each tier is a single C-level scan"""
+    return tuple(
+        (name, re.compile('|'.join(map(re.escape, keywords))))
+        for name, keywords in tiers.items()
+    )
+
+def _build_tier_automaton(tiers: Dict[str, Tuple[str, ...]]):
+    """Aho-Corasick automaton over every tier keyword; the payload is the tier's priority rank"""
+    automaton = ahocorasick.Automaton()
+    for rank, keywords in enumerate(tiers.values()):
+        for keyword in keywords:
+            # A keyword listed in several tiers belongs to the earliest one
+            if keyword not in automaton:
+                automaton.add_word(keyword, rank)
+    automaton.make_automaton()
+    return automaton
+
+_ISSUE_CATEGORY_PATTERNS = _compile_tiers(ISSUE_CATEGORIES)
+_URGENCY_PATTERNS = _compile_tiers(URGENCY_LEVELS)
+
+_ISSUE_CATEGORY_AUTOMATON = _build_tier_automaton(ISSUE_CATEGORIES) if AHOCORASICK_AVAILABLE else None
+_URGENCY_AUTOMATON = _build_tier_automaton(URGENCY_LEVELS) if AHOCORASICK_AVAILABLE else None
+
+@functools.lru_cache(maxsize=4096)
+def _first_matching_tier(patterns: Tuple[Tuple[str, 're.Pattern'], ...], automaton, text: str, default: str) -> str:
+    """Name of the first tier whose keywords occur in text (memoized per text)"""
+    return _match_tier(patterns, automaton, text.lower(), default)
+
+def _match_tier(patterns: Tuple[Tuple[str, 're.Pattern'], ...], automaton, text_lower: str, default: str) -> str:
+    """Uncached tier match on already lower-cased text, for one-off texts in bulk passes"""
+    if automaton is not None:
+        # Single pass over the text for all tiers, keeping the best rank seen
+        best = len(patterns)
+        for _, rank in automaton.iter(text_lower):
+            if rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return patterns[best][0] if best < len(patterns) else default
+    
+    for name, pattern in patterns:
+        if pattern.search(text_lower):
+            return name
+    return default
+
+# Closing remarks that mark a conversation as resolved, and agent messages
+# that describe a resolution step (substring match, case-insensitive)
+RESOLUTION_INDICATORS = (
+    'thank you', 'thanks', 'resolved', 'fixed', 'sorted',
+    'perfect', 'great', 'excellent', 'helped'
+)
+RESOLUTION_STEP_KEYWORDS = ('fixed', 'resolved', 'updated', 'processed')
+
+def _build_keyword_automaton(keywords: Tuple[str, ...]):
+    """Aho-Corasick automaton matching any of the (lower-case) keywords"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+_RESOLUTION_INDICATOR_PATTERN = re.compile('|'.join(map(re.escape, RESOLUTION_INDICATORS)), re.IGNORECASE)
+_RESOLUTION_STEP_PATTERN = re.compile('|'.join(map(re.escape, RESOLUTION_STEP_KEYWORDS)), re.IGNORECASE)
+
+_RESOLUTION_INDICATOR_AUTOMATON = (
+    _build_keyword_automaton(RESOLUTION_INDICATORS) if AHOCORASICK_AVAILABLE else None
+)
+_RESOLUTION_STEP_AUTOMATON = _build_keyword_automaton(RESOLUTION_STEP_KEYWORDS) if AHOCORASICK_AVAILABLE else None
+
+def _contains_keyword(pattern: 're.Pattern', automaton, text: str) -> bool:
+    """Whether any keyword occurs in text; one automaton pass when pyahocorasick is installed"""
+    if automaton is not None:
+        return next(automaton.iter(text.lower()), None) is not None
+    return pattern.search(text) is not None
+
+# Recommended agent actions per (urgency, negative sentiment), built once
+_URGENCY_ACTIONS = {
+    'critical': ("Escalate to supervisor immediately",),
+    'high': ("Prioritize this customer",)
+}
+_NEGATIVE_SENTIMENT_ACTIONS = ("Use empathetic language", "Acknowledge frustration")
+_DEFAULT_ACTIONS = ("Provide clear information",)
+_RECOMMENDED_ACTIONS = {
+    (urgency, negative): (
+        _URGENCY_ACTIONS.get(urgency, ()) + (_NEGATIVE_SENTIMENT_ACTIONS if negative else ())
+    ) or _DEFAULT_ACTIONS
+    for urgency in (*URGENCY_LEVELS, 'low')
+    for negative in (False, True)
+}
+
+# Semantic-search results are reused for repeated queries until the index
+# changes or the entry is older than the TTL
+_SIMILAR_CACHE_MAX_ENTRIES = 2048
+_SIMILAR_CACHE_TTL = 600
+
+# Concurrent awaited similarity searches are collected for up to this many
+# seconds (or queries) and embedded/searched together
+_SIMILAR_BATCH_WINDOW = 0.005
+_SIMILAR_BATCH_MAX = 64
+
+# Texts per embedding-model forward pass; inputs are length-sorted first so
+# each batch pads to a similar length
+_ENCODE_BATCH_SIZE = 64
+
+_EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Inference backend for the embedding model (config: rag.embedding_backend);
+# ONNX Runtime needs sentence-transformers>=3.2 with the [onnx] extra and
+# falls back to PyTorch when unavailable
+_DEFAULT_EMBEDDING_BACKEND = 'onnx'
+
+def _embedding_cache_tag(backend: str, model_file: Optional[str]) -> str:
+    """Embedding cache tag of the model variant loaded for these settings"""
+    if backend == 'torch':
+        return _EMBEDDING_MODEL_NAME
+    return f"{_EMBEDDING_MODEL_NAME}:{backend}:{model_file or ''}"
+
+@functools.lru_cache(maxsize=4)
+def _load_embedding_model(backend: str, model_file: Optional[str]) -> Tuple[Any, str]:
+    """
+    SentenceTransformer on the given backend, else eager PyTorch, loaded once per process.
+    
+    Also returns the tag identifying the model variant in the embedding
+    cache, as a quantized ONNX file produces slightly different vectors.
+    Loading the weights takes seconds, so it waits until something is
+    actually encoded; agents that only load a knowledge base or read
+    insights never pay for it.
+    """
+    if backend != 'torch':
+        try:
+            model_kwargs = {'file_name': model_file} if model_file else None
+            model = SentenceTransformer(_EMBEDDING_MODEL_NAME, backend=backend, model_kwargs=model_kwargs)
+            logger.info(f"Loaded embedding model with {backend} backend")
+            return model, _embedding_cache_tag(backend, model_file)
+        except Exception as e:
+            logger.warning(f"Embedding backend {backend!r} unavailable, using PyTorch: {e}")
+    
+    return SentenceTransformer(_EMBEDDING_MODEL_NAME), _embedding_cache_tag('torch', None)
+
+# Keys per SELECT when reading the on-disk embedding cache (stays well under
+# SQLite's bound-parameter limit)
+_EMBEDDING_CACHE_LOOKUP_CHUNK = 500
+
+# Below this many conversations a scan of every (8-bit quantized) vector is
+# fast enough and IVF-PQ training would not pay for itself
+_IVF_MIN_VECTORS = 10_000
+_IVF_MAX_LISTS = 4096
+_PQ_SUBQUANTIZERS = 16
+_PQ_BITS = 8
+_DEFAULT_NPROBE = 16
+
 class UnifiedCallCenterAI:
     """
     Unified Call Center AI Agent with integrated RAG, AWS services, and analytics
@@ -49,15 +364,30 @@ class UnifiedCallCenterAI:
     def __init__(self, config_path: str = "config/config.yaml"):
         """Initialize the unified AI system"""
         
-        # Load configuration
-        with open(config_path, 'r') as file:
-            self.config = yaml.safe_load(file)
+        # Load configuration (parsed once per path and shared, treat as read-only)
+        self.config = _load_config(config_path)
         
         # AWS configuration
         self.region = os.getenv('AWS_REGION', self.config['aws']['region'])
         
-        # Initialize AWS clients
-        self._init_aws_clients()
+        # Bedrock settings read on every call
+        bedrock_config = self.config['aws']['bedrock']
+        self._bedrock_model_id = bedrock_config['model_id']
+        self._bedrock_temperature = bedrock_config.get('temperature', 0.7)
+        self._bedrock_body_templates = {}
+        self._bedrock_pending = {}
+        
+        # Initialize AWS clients and the thread pool their blocking calls run on
+        self.io_threads = self.config['agent'].get('io_threads', _DEFAULT_IO_THREADS)
+        self._io_pool = _io_executor(self.io_threads)
+        
+        # Bound concurrent calls per service so large batches queue locally
+        # instead of tripping Bedrock/Comprehend throttling
+        self._inflight_limits = {
+            'bedrock': bedrock_config.get('max_inflight', 10),
+            'comprehend': self.config['aws'].get('comprehend', {}).get('max_inflight', 20)
+        }
+        self._semaphores = weakref.WeakKeyDictionary()
         
         # Initialize ML components (if available)
         self.ml_ready = False
@@ -65,12 +395,27 @@ class UnifiedCallCenterAI:
             self._init_ml_components()
         
         # Knowledge base storage
+        self.nprobe = self.config.get('rag', {}).get('nprobe', _DEFAULT_NPROBE)
+        self.embedding_cache_path = self.config.get('rag', {}).get('embedding_cache_path')
         self.conversation_index = None
+        self._gpu_resources = None
+        # FAISS GPU indexes (and their shared GPU resources) are not thread
+        # safe, and searches run on the I/O pool, so every index read or
+        # write and the rows it maps to are guarded by this lock
+        self._index_lock = threading.Lock()
+        # Search results are only read and written on the event loop; index
+        # swaps from worker threads bump the generation instead of clearing
+        # the cache, and entries from older generations are ignored
+        self._similar_cache = OrderedDict()
+        self._index_generation = 0
+        self._similar_batches = weakref.WeakKeyDictionary()
         self.conversation_metadata = []
         self.issue_patterns = {}
+        self._issue_counts = {}
         self.resolution_templates = {}
         self.agent_performance_data = {}
         self.knowledge_base_loaded = False
+        self._knowledge_base_task = None
         
         # Agent settings
         self.agent_name = self.config['agent']['name']
@@ -78,29 +423,119 @@ class UnifiedCallCenterAI:
         
         logger.info(f"Initialized {self.agent_name} with capabilities: {self.capabilities}")
     
-    def _init_aws_clients(self):
-        """Initialize all required AWS service clients"""
-        try:
-            # Core AWS clients
-            self.bedrock_client = boto3.client('bedrock-runtime', region_name=self.region)
-            self.s3_client = boto3.client('s3', region_name=self.region)
-            self.comprehend_client = boto3.client('comprehend', region_name=self.region)
-            
-            # Optional clients (initialize only if needed)
-            self.transcribe_client = None
-            self.dynamodb_client = None
-            
-            logger.info("Successfully initialized AWS clients")
-            
-        except Exception as e:
-            logger.error(f"Error initializing AWS clients: {e}")
-            raise
+    async def _to_io(self, func, *args, **kwargs):
+        """Await a blocking boto3 call on the agent's AWS I/O thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(func, *args, **kwargs))
+    
+    def _inflight(self, service: str) -> asyncio.Semaphore:
+        """Per-service cap on in-flight calls for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.get(loop)
+        if semaphores is None:
+            semaphores = self._semaphores[loop] = {
+                name: asyncio.Semaphore(limit) for name, limit in self._inflight_limits.items()
+            }
+        return semaphores[service]
+    
+    async def _detect_sentiment(self, text: str) -> Dict[str, Any]:
+        """Comprehend detect_sentiment, bounded and run on the I/O pool"""
+        async with self._inflight('comprehend'):
+            return await self._to_io(self.comprehend_client.detect_sentiment, Text=text, LanguageCode='en')
+    
+    async def _batch_detect_sentiments(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Comprehend sentiment for many texts, _COMPREHEND_BATCH_SIZE per request.
+        
+        Results line up with ``texts``; an entry is None when Comprehend
+        rejected that document (or its whole batch failed), so the caller can
+        fall back to a single detect_sentiment call.
+        """
+        async def detect_batch(start: int) -> List[Optional[Dict[str, Any]]]:
+            batch = texts[start:start + _COMPREHEND_BATCH_SIZE]
+            results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+            try:
+                async with self._inflight('comprehend'):
+                    response = await self._to_io(
+                        self.comprehend_client.batch_detect_sentiment,
+                        TextList=batch,
+                        LanguageCode='en'
+                    )
+            except Exception as e:
+                logger.warning(f"Comprehend batch sentiment failed: {e}")
+                return results
+            for item in response.get('ResultList', []):
+                results[item['Index']] = item
+            for error in response.get('ErrorList', []):
+                logger.warning(f"Comprehend rejected document {start + error['Index']}: {error.get('ErrorMessage')}")
+            return results
+        
+        batches = await asyncio.gather(*[
+            detect_batch(start) for start in range(0, len(texts), _COMPREHEND_BATCH_SIZE)
+        ])
+        return [result for batch in batches for result in batch]
+    
+    # AWS service clients are created on first use, so a run that only needs
+    # Bedrock never builds the others
+    
+    @functools.cached_property
+    def bedrock_client(self):
+        """Bedrock runtime client"""
+        return _aws_client('bedrock-runtime', self.region, self.io_threads)
+    
+    @functools.cached_property
+    def s3_client(self):
+        """S3 client"""
+        return _aws_client('s3', self.region, self.io_threads)
+    
+    @functools.cached_property
+    def comprehend_client(self):
+        """Comprehend client"""
+        return _aws_client('comprehend', self.region, self.io_threads)
+    
+    @functools.cached_property
+    def transcribe_client(self):
+        """Transcribe client"""
+        return _aws_client('transcribe', self.region, self.io_threads)
+    
+    @functools.cached_property
+    def dynamodb_client(self):
+        """DynamoDB client"""
+        return _aws_client('dynamodb', self.region, self.io_threads)
+    
+    @property
+    def _embedding_settings(self) -> Tuple[str, Optional[str]]:
+        """Configured (backend, model file) for the embedding model"""
+        rag_config = self.config.get('rag', {})
+        return (
+            rag_config.get('embedding_backend', _DEFAULT_EMBEDDING_BACKEND),
+            rag_config.get('embedding_model_file')
+        )
+    
+    @functools.cached_property
+    def _embedding(self) -> Tuple[Any, str]:
+        """Shared (model, cache tag) for the configured embedding backend"""
+        return _load_embedding_model(*self._embedding_settings)
+    
+    def _embedding_tag(self) -> str:
+        """
+        Embedding cache tag, taken from the configuration until the model
+        is loaded so fully cached texts never load it
+        """
+        if '_embedding' in self.__dict__:
+            return self._embedding[1]
+        return _embedding_cache_tag(*self._embedding_settings)
+    
+    @property
+    def embedding_model(self):
+        """Sentence embedding model, loaded on first use and shared by every agent in the process"""
+        return self._embedding[0]
     
     def _init_ml_components(self):
         """Initialize ML components if libraries are available"""
         try:
-            # Initialize embedding model
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            # The embedding model itself is loaded on first encode (see embedding_model)
+            _import_ml_libraries()
             self.ml_ready = True
             logger.info("ML components initialized successfully")
             
@@ -112,7 +547,8 @@ class UnifiedCallCenterAI:
     # CORE ANALYSIS METHODS
     # =============================================================================
     
-    async def analyze_conversation(self, conversation_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_conversation(self, conversation_data: Dict[str, Any],
+                                   comprehend_sentiment: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Comprehensive conversation analysis with RAG enhancement
         
@@ -120,14 +556,18 @@ class UnifiedCallCenterAI:
             conversation_data: Dictionary containing conversation information
                 Required: 'transcription' or 'messages'
                 Optional: 'call_id', 'customer_id', etc.
+            comprehend_sentiment: Comprehend sentiment already fetched for this
+                transcript (e.g. by a batch call); skips the per-call request
                 
         Returns:
             Complete analysis results
         """
         try:
+            # One timestamp for the analysis and all of its parts
+            timestamp = datetime.now().isoformat()
             results = {
                 'conversation_id': conversation_data.get('call_id', conversation_data.get('conversation_id')),
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': timestamp,
                 'analyses': {}
             }
             
@@ -136,22 +576,26 @@ class UnifiedCallCenterAI:
             if not transcript:
                 return {'error': 'No transcript found in conversation data'}
             
+            # Truncate once for all analyses; the helpers' own slices of an
+            # already-short string return it as-is instead of copying
+            prompt_transcript = transcript[:_PROMPT_TRANSCRIPT_CHARS]
+            
             # Run parallel analyses
             tasks = []
             
             # Basic analyses
             if 'call_summarization' in self.capabilities:
-                tasks.append(self._generate_summary(transcript))
+                tasks.append(self._generate_summary(prompt_transcript, timestamp))
             
             if 'sentiment_analysis' in self.capabilities:
-                tasks.append(self._analyze_sentiment(transcript))
+                tasks.append(self._analyze_sentiment(transcript[:_COMPREHEND_TEXT_CHARS], timestamp, comprehend_sentiment))
             
             if 'compliance_checking' in self.capabilities:
-                tasks.append(self._check_compliance(transcript))
+                tasks.append(self._check_compliance(prompt_transcript, timestamp))
             
             # RAG-enhanced analyses (if knowledge base is loaded)
             if self.knowledge_base_loaded and self.ml_ready:
-                tasks.append(self._get_rag_insights(transcript))
+                tasks.append(self._get_rag_insights(transcript, timestamp))
             
             # Execute all analyses concurrently
             if tasks:
@@ -195,75 +639,56 @@ class UnifiedCallCenterAI:
         
         return ""
     
-    async def _generate_summary(self, transcript: str) -> Dict[str, Any]:
+    async def _generate_summary(self, transcript: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Generate conversation summary using Bedrock"""
         try:
-            prompt = f"""
-            Analyze this customer service conversation and provide a structured summary:
-            
-            1. ISSUE: What was the customer's main problem or request?
-            2. RESOLUTION: How was the issue addressed?
-            3. OUTCOME: Was the issue resolved? Customer satisfaction level?
-            4. FOLLOW-UP: Any required follow-up actions?
-            5. KEY_POINTS: Important details or context
-            
-            Conversation:
-            {transcript[:3000]}
-            
-            Summary:
-            """
+            prompt = _SUMMARY_PROMPT_HEAD + transcript[:_PROMPT_TRANSCRIPT_CHARS] + _SUMMARY_PROMPT_TAIL
             
             response = await self._call_bedrock(prompt)
             
             return {
                 'summary': response,
-                'summary_generated_at': datetime.now().isoformat()
+                'summary_generated_at': timestamp or datetime.now().isoformat()
             }
             
         except Exception as e:
             logger.error(f"Error generating summary: {e}")
             return {'summary': None, 'error': str(e)}
     
-    async def _analyze_sentiment(self, transcript: str) -> Dict[str, Any]:
+    async def _analyze_sentiment(self, transcript: str, timestamp: Optional[str] = None,
+                                 comprehend_response: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Comprehensive sentiment analysis"""
         try:
-            # Use AWS Comprehend for quick sentiment
-            comprehend_result = {}
-            try:
-                comprehend_response = self.comprehend_client.detect_sentiment(
-                    Text=transcript[:5000],  # Comprehend text limit
-                    LanguageCode='en'
+            # Enhanced sentiment analysis with Bedrock
+            prompt = _SENTIMENT_PROMPT_HEAD + transcript[:_PROMPT_TRANSCRIPT_CHARS] + _SENTIMENT_PROMPT_TAIL
+            
+            if comprehend_response is not None:
+                # Comprehend result was prefetched by a batch call
+                bedrock_analysis = await self._call_bedrock(prompt)
+            else:
+                # Quick Comprehend sentiment runs in a worker thread alongside Bedrock
+                comprehend_response, bedrock_analysis = await asyncio.gather(
+                    self._detect_sentiment(transcript[:_COMPREHEND_TEXT_CHARS]),  # Comprehend text limit
+                    self._call_bedrock(prompt),
+                    return_exceptions=True
                 )
+            if isinstance(bedrock_analysis, Exception):
+                raise bedrock_analysis
+            
+            comprehend_result = {}
+            if isinstance(comprehend_response, Exception):
+                logger.warning(f"Comprehend sentiment analysis failed: {comprehend_response}")
+            else:
                 comprehend_result = {
                     'overall': comprehend_response['Sentiment'],
                     'confidence_scores': comprehend_response['SentimentScore']
                 }
-            except Exception as e:
-                logger.warning(f"Comprehend sentiment analysis failed: {e}")
-            
-            # Enhanced sentiment analysis with Bedrock
-            prompt = f"""
-            Analyze the sentiment and emotional journey in this conversation:
-            
-            1. CUSTOMER_SENTIMENT: Overall customer emotional state
-            2. SENTIMENT_PROGRESSION: How did emotions change during the call?
-            3. AGENT_EMPATHY: How well did the agent handle customer emotions?
-            4. EMOTIONAL_TRIGGERS: What caused emotional reactions?
-            5. SATISFACTION_LEVEL: Likely customer satisfaction (1-10)
-            
-            Conversation:
-            {transcript[:3000]}
-            
-            Sentiment Analysis:
-            """
-            
-            bedrock_analysis = await self._call_bedrock(prompt)
             
             return {
                 'sentiment': {
                     **comprehend_result,
                     'detailed_analysis': bedrock_analysis,
-                    'analyzed_at': datetime.now().isoformat()
+                    'analyzed_at': timestamp or datetime.now().isoformat()
                 }
             }
             
@@ -271,36 +696,17 @@ class UnifiedCallCenterAI:
             logger.error(f"Error analyzing sentiment: {e}")
             return {'sentiment': {'error': str(e)}}
     
-    async def _check_compliance(self, transcript: str) -> Dict[str, Any]:
+    async def _check_compliance(self, transcript: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Check conversation for compliance issues"""
         try:
-            prompt = f"""
-            Review this customer service conversation for compliance and quality:
-            
-            Check for:
-            1. GREETING: Proper professional greeting
-            2. IDENTIFICATION: Agent identified themselves and company
-            3. VERIFICATION: Customer identity verification (if applicable)
-            4. INFORMATION_DISCLOSURE: Required disclosures made
-            5. PROFESSIONALISM: Professional language and tone maintained
-            6. RESOLUTION_PROCESS: Proper problem-solving approach
-            7. CLOSING: Appropriate conversation closing
-            8. VIOLATIONS: Any potential compliance issues
-            
-            Rate each area as: EXCELLENT / GOOD / NEEDS_IMPROVEMENT / POOR
-            
-            Conversation:
-            {transcript[:3000]}
-            
-            Compliance Review:
-            """
+            prompt = _COMPLIANCE_PROMPT_HEAD + transcript[:_PROMPT_TRANSCRIPT_CHARS] + _COMPLIANCE_PROMPT_TAIL
             
             compliance_review = await self._call_bedrock(prompt)
             
             return {
                 'compliance': {
                     'review': compliance_review,
-                    'checked_at': datetime.now().isoformat()
+                    'checked_at': timestamp or datetime.now().isoformat()
                 }
             }
             
@@ -308,14 +714,14 @@ class UnifiedCallCenterAI:
             logger.error(f"Error checking compliance: {e}")
             return {'compliance': {'error': str(e)}}
     
-    async def _get_rag_insights(self, transcript: str) -> Dict[str, Any]:
+    async def _get_rag_insights(self, transcript: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Get RAG-powered insights"""
         try:
             if not self.ml_ready:
                 return {'rag_insights': {'error': 'ML components not available'}}
             
             # Find similar conversations
-            similar_convs = self.find_similar_conversations(transcript)
+            similar_convs = await self.find_similar_conversations_async(transcript)
             
             # Detect issue category
             issue_category = self._detect_issue_category(transcript)
@@ -332,7 +738,7 @@ class UnifiedCallCenterAI:
                     'issue_category': issue_category,
                     'resolution_suggestions': suggestions,
                     'category_insights': category_insights,
-                    'generated_at': datetime.now().isoformat()
+                    'generated_at': timestamp or datetime.now().isoformat()
                 }
             }
             
@@ -349,15 +755,8 @@ class UnifiedCallCenterAI:
         try:
             logger.info("Initializing knowledge base...")
             
-            kb_path = self.config.get('rag', {}).get('knowledge_base_path', 'data/knowledge_base.pkl')
-            
-            if os.path.exists(kb_path):
-                logger.info("Loading existing knowledge base...")
-                self.load_knowledge_base(kb_path)
-            else:
-                logger.info("Building new knowledge base from chat data...")
-                self.process_chat_data(chat_data_path)
-                self.save_knowledge_base(kb_path)
+            # Loading or building is blocking file/model work; keep it off the event loop
+            await self._to_io(self._load_or_build_knowledge_base, chat_data_path)
             
             self.knowledge_base_loaded = True
             logger.info("Knowledge base initialized successfully")
@@ -366,6 +765,27 @@ class UnifiedCallCenterAI:
             logger.error(f"Error initializing knowledge base: {e}")
             raise
     
+    def _load_or_build_knowledge_base(self, chat_data_path: str) -> None:
+        """Load the saved knowledge base, or build and save it from chat data"""
+        kb_path = self.config.get('rag', {}).get('knowledge_base_path', 'data/knowledge_base.json')
+        
+        if os.path.exists(kb_path):
+            logger.info("Loading existing knowledge base...")
+            self.load_knowledge_base(kb_path)
+        else:
+            logger.info("Building new knowledge base from chat data...")
+            self.process_chat_data(chat_data_path)
+            self.save_knowledge_base(kb_path)
+    
+    async def _ensure_knowledge_base(self) -> None:
+        """Initialize the knowledge base once, however many callers arrive before it is ready"""
+        if self.knowledge_base_loaded:
+            return
+        # A failed initialization is retried by the next caller
+        if self._knowledge_base_task is None or self._knowledge_base_task.done():
+            self._knowledge_base_task = asyncio.ensure_future(self.initialize_knowledge_base())
+        await self._knowledge_base_task
+    
     def process_chat_data(self, chat_data_path: str) -> None:
         """Process chat data and build knowledge base"""
         if not self.ml_ready:
@@ -375,17 +795,16 @@ class UnifiedCallCenterAI:
         try:
             logger.info(f"Processing chat data from {chat_data_path}")
             
-            with open(chat_data_path, 'r') as f:
-                chat_data = json.load(f)
-            
             # Group messages into conversations
-            conversations = self._group_conversations(chat_data)
-            
-            # Extract patterns and templates
-            self._extract_patterns(conversations)
+            conversations = self._group_conversations(self._iter_chat_messages(chat_data_path))
             
-            # Build vector index
-            self._build_conversation_index(conversations)
+            # Build the vector index on a worker thread (the embedding model
+            # releases the GIL in its forward pass) while patterns and
+            # templates are extracted here; the two touch disjoint state
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                indexing = executor.submit(self._build_conversation_index, conversations)
+                self._extract_patterns(conversations)
+                indexing.result()
             
             logger.info(f"Processed {len(conversations)} conversations")
             
@@ -393,7 +812,19 @@ class UnifiedCallCenterAI:
             logger.error(f"Error processing chat data: {e}")
             raise
     
-    def _group_conversations(self, chat_data: List[Dict]) -> Dict[str, Dict]:
+    def _iter_chat_messages(self, chat_data_path: str) -> Iterator[Dict]:
+        """Yield chat messages from the JSON array file, streamed when ijson is installed"""
+        if not IJSON_AVAILABLE:
+            with open(chat_data_path, 'r') as f:
+                yield from json.load(f)
+            return
+        
+        # Messages are parsed one at a time, so only the grouped
+        # conversations are ever held in memory
+        with open(chat_data_path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    
+    def _group_conversations(self, chat_data: Iterable[Dict]) -> Dict[str, Dict]:
         """Group chat messages into complete conversations"""
         conversations = defaultdict(lambda: {
             'messages': [],
@@ -440,28 +871,27 @@ class UnifiedCallCenterAI:
         if len(messages) < 2:
             return False
         
-        last_messages = ' '.join([msg['text'].lower() for msg in messages[-3:]])
-        
-        resolution_indicators = [
-            'thank you', 'thanks', 'resolved', 'fixed', 'sorted',
-            'perfect', 'great', 'excellent', 'helped'
-        ]
-        
-        return any(indicator in last_messages for indicator in resolution_indicators)
+        last_messages = ' '.join([msg['text'] for msg in messages[-3:]])
+        return _contains_keyword(_RESOLUTION_INDICATOR_PATTERN, _RESOLUTION_INDICATOR_AUTOMATON, last_messages)
     
-    def _extract_patterns(self, conversations: Dict[str, Dict]) -> None:
-        """Extract issue patterns and resolution templates"""
+    def _extract_patterns(self, conversations: Dict[str, Dict], reset: bool = True) -> None:
+        """Extract issue patterns and resolution templates (appending to the existing ones unless reset)"""
         # Issue categorization patterns
-        self.issue_patterns = defaultdict(list)
-        self.resolution_templates = defaultdict(list)
+        if reset:
+            self.issue_patterns = defaultdict(list)
+            self.resolution_templates = defaultdict(list)
+        else:
+            self.issue_patterns = defaultdict(list, self.issue_patterns)
+            self.resolution_templates = defaultdict(list, self.resolution_templates)
         
         for contact_id, conv in conversations.items():
             if not conv['customer_messages']:
                 continue
             
-            # Categorize issue
+            # Categorize issue; the text is lowered once and each first message
+            # is seen only once, so skip the memoized detector (and its cache)
             first_message = conv['customer_messages'][0].lower()
-            category = self._detect_issue_category(first_message)
+            category = _match_tier(_ISSUE_CATEGORY_PATTERNS, _ISSUE_CATEGORY_AUTOMATON, first_message, 'other')
             
             self.issue_patterns[category].append({
                 'contact_id': contact_id,
@@ -471,34 +901,28 @@ class UnifiedCallCenterAI:
             
             # Extract resolution templates for resolved conversations
             if conv['resolved'] and conv['agent_messages']:
-                resolution_steps = [msg for msg in conv['agent_messages'] 
-                                  if any(word in msg.lower() for word in 
-                                        ['fixed', 'resolved', 'updated', 'processed'])]
+                resolution_steps = [msg for msg in conv['agent_messages']
+                                    if _contains_keyword(_RESOLUTION_STEP_PATTERN, _RESOLUTION_STEP_AUTOMATON, msg)]
                 
                 if resolution_steps:
                     self.resolution_templates[category].append({
                         'contact_id': contact_id,
                         'steps': resolution_steps
                     })
+        
+        self._count_issue_resolutions()
+    
+    def _count_issue_resolutions(self) -> None:
+        """Per-category (total, resolved) counts, so insights never rescan the cases"""
+        self._issue_counts = {
+            category: (len(patterns), sum(1 for p in patterns if p['resolved']))
+            for category, patterns in self.issue_patterns.items()
+            if patterns
+        }
     
     def _detect_issue_category(self, text: str) -> str:
         """Detect issue category from text"""
-        text_lower = text.lower()
-        
-        categories = {
-            'billing': ['bill', 'charge', 'payment', 'cost', 'fee'],
-            'technical': ['not working', 'broken', 'problem', 'error'],
-            'account': ['account', 'login', 'password', 'access'],
-            'service': ['cancel', 'upgrade', 'plan', 'change'],
-            'roaming': ['roaming', 'overseas', 'international'],
-            'data': ['data', 'internet', 'wifi', 'slow']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return category
-        
-        return 'other'
+        return _first_matching_tier(_ISSUE_CATEGORY_PATTERNS, _ISSUE_CATEGORY_AUTOMATON, text, 'other')
     
     def _build_conversation_index(self, conversations: Dict[str, Dict]) -> None:
         """Build FAISS vector index for semantic search"""
@@ -506,67 +930,372 @@ class UnifiedCallCenterAI:
             return
         
         try:
-            conversation_texts = []
-            metadata = []
-            
-            for contact_id, conv in conversations.items():
-                # Create summary text
-                customer_text = ' '.join(conv['customer_messages'][:3])
-                agent_text = ' '.join(conv['agent_messages'][:3])
-                summary_text = f"Customer: {customer_text} Agent: {agent_text}"
-                
-                conversation_texts.append(summary_text)
-                metadata.append({
-                    'contact_id': contact_id,
-                    'resolved': conv['resolved'],
-                    'full_conversation': conv['messages']
-                })
+            conversation_texts, metadata = self._index_entries(conversations)
             
-            # Generate embeddings
-            embeddings = self.embedding_model.encode(conversation_texts)
+            # Generate embeddings (unit length, so inner product is cosine similarity)
+            embeddings = self._encode_cached(conversation_texts)
             
             # Build FAISS index
-            dimension = embeddings.shape[1]
-            self.conversation_index = faiss.IndexFlatIP(dimension)
-            
-            # Normalize for cosine similarity
-            faiss.normalize_L2(embeddings)
-            self.conversation_index.add(embeddings.astype('float32'))
-            
-            self.conversation_metadata = metadata
+            index = self._create_index(embeddings)
+            with self._index_lock:
+                self.conversation_index = index
+                self.conversation_metadata = metadata
+                self._index_generation += 1
             
             logger.info(f"Built conversation index with {len(conversation_texts)} entries")
             
         except Exception as e:
             logger.error(f"Error building conversation index: {e}")
     
+    def _index_entries(self, conversations: Dict[str, Dict]) -> Tuple[List[str], List[Dict]]:
+        """Summary texts to embed and their metadata rows, ordered by text length"""
+        conversation_texts = []
+        metadata = []
+        
+        for contact_id, conv in conversations.items():
+            # Create summary text
+            customer_text = ' '.join(conv['customer_messages'][:3])
+            agent_text = ' '.join(conv['agent_messages'][:3])
+            summary_text = f"Customer: {customer_text} Agent: {agent_text}"
+            
+            conversation_texts.append(summary_text)
+            metadata.append({
+                'contact_id': contact_id,
+                'resolved': conv['resolved'],
+                'full_conversation': conv['messages']
+            })
+        
+        # Index rows in text-length order: encoding batches stay length
+        # homogeneous and the embeddings need no reordering copy
+        order = sorted(range(len(conversation_texts)), key=lambda i: len(conversation_texts[i]))
+        return [conversation_texts[i] for i in order], [metadata[i] for i in order]
+    
+    def add_conversations(self, conversations: Dict[str, Dict]) -> int:
+        """
+        Add newly arrived conversations to the knowledge base without a rebuild
+        
+        Only contact_ids not already indexed are categorized, embedded and
+        appended to the existing FAISS index (IVF-PQ and scalar-quantized
+        indexes accept adds after their one-time training). Falls back to a
+        full build when there is no index yet.
+        
+        Args:
+            conversations: Grouped conversations, as from _group_conversations
+            
+        Returns:
+            Number of conversations added
+        """
+        if not self.ml_ready:
+            logger.warning("ML components not available - skipping knowledge base update")
+            return 0
+        
+        indexed_ids = {row['contact_id'] for row in self.conversation_metadata}
+        new_conversations = {
+            contact_id: conv for contact_id, conv in conversations.items()
+            if contact_id not in indexed_ids
+        }
+        if not new_conversations:
+            return 0
+        
+        self._extract_patterns(new_conversations, reset=self.conversation_index is None)
+        
+        if self.conversation_index is None:
+            self._build_conversation_index(new_conversations)
+        else:
+            conversation_texts, metadata = self._index_entries(new_conversations)
+            embeddings = self._encode_cached(conversation_texts)
+            with self._index_lock:
+                self.conversation_index.add(embeddings)
+                self.conversation_metadata.extend(metadata)
+                self._index_generation += 1
+            logger.info(f"Added {len(conversation_texts)} conversations to the index")
+        
+        return len(new_conversations)
+    
+    def _create_index(self, embeddings):
+        """
+        Inner-product FAISS index holding embeddings.
+        
+        Small knowledge bases get a flat scan over 8-bit scalar-quantized
+        vectors (one byte per dimension, a quarter of float32). Large ones get
+        IVF-PQ: vectors are compressed to _PQ_SUBQUANTIZERS bytes each and a
+        search only scans the nprobe closest of nlist clusters.
+        """
+        count, dimension = embeddings.shape
+        if count < _IVF_MIN_VECTORS:
+            index = faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            nlist = min(_IVF_MAX_LISTS, int(4 * math.sqrt(count)))
+            quantizer = faiss.IndexFlatIP(dimension)
+            index = faiss.IndexIVFPQ(
+                quantizer, dimension, nlist, _PQ_SUBQUANTIZERS, _PQ_BITS, faiss.METRIC_INNER_PRODUCT
+            )
+        index.train(embeddings)
+        index.add(embeddings)
+        index = self._index_to_gpu(index)
+        self._configure_index(index)
+        return index
+    
+    def _index_to_gpu(self, index):
+        """
+        Copy an IVF index to GPU 0 when faiss has GPU support and a device.
+        
+        Flat scalar-quantized indexes have no GPU implementation and are small
+        enough to stay on the CPU.
+        """
+        if not isinstance(index, faiss.IndexIVF) or faiss.get_num_gpus() == 0:
+            return index
+        if self._gpu_resources is None:
+            self._gpu_resources = faiss.StandardGpuResources()
+        options = faiss.GpuClonerOptions()
+        options.useFloat16 = True
+        with self._index_lock:
+            return faiss.index_cpu_to_gpu(self._gpu_resources, 0, index, options)
+    
+    def _configure_index(self, index) -> None:
+        """Apply search-time settings (not all are persisted with the index)"""
+        if hasattr(index, 'nprobe'):
+            index.nprobe = self.nprobe
+    
     def find_similar_conversations(self, query: str, top_k: int = 5) -> List[Dict]:
         """Find similar conversations using semantic search"""
         if not self.ml_ready or self.conversation_index is None:
             return []
         
+        # Reuse a recent search for the same query with at least top_k hits
+        cache_key = hashlib.blake2b(query.encode('utf-8'), digest_size=16).digest()
+        cached = self._cached_similar(cache_key, top_k)
+        if cached is not None:
+            return cached
+        
         try:
             # Generate query embedding
-            query_embedding = self.embedding_model.encode([query])
-            faiss.normalize_L2(query_embedding)
+            query_embedding = self._encode([query])
+            results = self._search_index(query_embedding, top_k)[0]
+            self._store_similar(cache_key, top_k, results)
+            return [dict(result) for result in results]
             
-            # Search
-            scores, indices = self.conversation_index.search(
-                query_embedding.astype('float32'), top_k
+        except Exception as e:
+            logger.error(f"Error finding similar conversations: {e}")
+            return []
+    
+    def find_similar_conversations_batch(self, queries: List[str], top_k: int = 5) -> List[List[Dict]]:
+        """
+        Semantic search for many queries at once
+        
+        Queries not already cached are embedded in a single encoder call and
+        searched with a single FAISS query, and the results are cached so
+        later per-query lookups are free.
+        """
+        if not self.ml_ready or self.conversation_index is None:
+            return [[] for _ in queries]
+        
+        keys = [hashlib.blake2b(query.encode('utf-8'), digest_size=16).digest() for query in queries]
+        found = {}
+        for key in keys:
+            if key not in found:
+                cached = self._cached_similar(key, top_k)
+                if cached is not None:
+                    found[key] = cached
+        
+        missing = {}
+        for key, query in zip(keys, queries):
+            if key not in found:
+                missing.setdefault(key, query)
+        
+        if missing:
+            try:
+                embeddings = self._encode(list(missing.values()))
+                for key, results in zip(missing, self._search_index(embeddings, top_k)):
+                    self._store_similar(key, top_k, results)
+                    found[key] = results
+            except Exception as e:
+                logger.error(f"Error finding similar conversations: {e}")
+                for key in missing:
+                    found[key] = []
+        
+        return [[dict(result) for result in found[key]] for key in keys]
+    
+    async def find_similar_conversations_async(self, query: str, top_k: int = 5) -> List[Dict]:
+        """
+        Awaitable find_similar_conversations that coalesces concurrent callers.
+        
+        Queries awaited within _SIMILAR_BATCH_WINDOW of each other (up to
+        _SIMILAR_BATCH_MAX) are embedded in one encoder call and searched with
+        one FAISS query on the I/O pool, so the event loop is never blocked
+        by the model.
+        """
+        if not self.ml_ready or self.conversation_index is None:
+            return []
+        
+        cache_key = hashlib.blake2b(query.encode('utf-8'), digest_size=16).digest()
+        cached = self._cached_similar(cache_key, top_k)
+        if cached is not None:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._similar_batches.get(loop)
+        if pending is None:
+            flush = loop.call_later(_SIMILAR_BATCH_WINDOW, self._flush_similar_batch, loop)
+            pending = self._similar_batches[loop] = ([], flush)
+        pending[0].append((cache_key, query, top_k, future))
+        if len(pending[0]) >= _SIMILAR_BATCH_MAX:
+            self._flush_similar_batch(loop)
+        return await future
+    
+    def _flush_similar_batch(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start searching the queries collected so far on this loop"""
+        pending = self._similar_batches.pop(loop, None)
+        if pending is not None:
+            batch, flush = pending
+            flush.cancel()
+            loop.create_task(self._run_similar_batch(batch))
+    
+    async def _run_similar_batch(self, batch: List[Tuple[bytes, str, int, asyncio.Future]]) -> None:
+        """Embed and search a coalesced batch, then resolve each caller's future"""
+        queries = {}
+        for cache_key, query, _, _ in batch:
+            queries.setdefault(cache_key, query)
+        top_k = max(k for _, _, k, _ in batch)
+        
+        try:
+            # Results are cached under the generation seen before searching,
+            # so a search that overlaps an index swap is never served later
+            generation = self._index_generation
+            searched = await self._to_io(
+                lambda: self._search_index(self._encode(list(queries.values())), top_k)
             )
-            
+            results = dict(zip(queries, searched))
+            # Cache updates stay on the event loop thread
+            for cache_key, results_for_key in results.items():
+                self._store_similar(cache_key, top_k, results_for_key, generation)
+        except Exception as e:
+            logger.error(f"Error finding similar conversations: {e}")
+            results = {cache_key: [] for cache_key in queries}
+        
+        for cache_key, _, k, future in batch:
+            if not future.done():
+                future.set_result([dict(result) for result in results[cache_key][:k]])
+    
+    def _encode(self, texts: List[str]):
+        """
+        L2-normalized float32 embeddings for texts, in input order.
+        
+        Texts are encoded shortest first so each batch pads to a similar
+        length (SBERT "smart batching"), then the rows are put back in the
+        caller's order. Callers that pass texts already sorted by length get
+        the model's float32 array back without any copy.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        presorted = all(position == i for position, i in enumerate(order))
+        embeddings = self.embedding_model.encode(
+            texts if presorted else [texts[i] for i in order],
+            batch_size=_ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        if not presorted:
+            inverse = [0] * len(order)
+            for position, i in enumerate(order):
+                inverse[i] = position
+            embeddings = embeddings[inverse]
+        return embeddings.astype('float32', copy=False)
+    
+    def _encode_cached(self, texts: List[str]):
+        """
+        Like _encode, but reuses vectors from the on-disk embedding cache.
+        
+        Vectors are keyed by SHA-1 of model variant + text and stored as float16,
+        so rebuilding the knowledge base from the same (or overlapping) chat
+        data only runs the model on new conversation text.
+        """
+        if not self.embedding_cache_path or not texts:
+            return self._encode(texts)
+        
+        tag = self._embedding_tag()
+        keys = [
+            hashlib.sha1(f"{tag}\0{text}".encode('utf-8')).digest()
+            for text in texts
+        ]
+        try:
+            with closing(sqlite3.connect(self.embedding_cache_path)) as db:
+                db.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+                
+                vectors = {}
+                unique_keys = list(dict.fromkeys(keys))
+                for start in range(0, len(unique_keys), _EMBEDDING_CACHE_LOOKUP_CHUNK):
+                    chunk = unique_keys[start:start + _EMBEDDING_CACHE_LOOKUP_CHUNK]
+                    placeholders = ','.join('?' * len(chunk))
+                    vectors.update(db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ))
+                
+                missing = {}
+                for key, text in zip(keys, texts):
+                    if key not in vectors:
+                        missing.setdefault(key, text)
+                logger.info(f"Embedding cache: {len(unique_keys) - len(missing)} hits, {len(missing)} misses")
+                
+                if missing:
+                    if self._embedding[1] != tag:
+                        # The configured backend fell back to another variant;
+                        # look its vectors up under the tag actually loaded
+                        return self._encode_cached(texts)
+                    fresh = self._encode(list(missing.values()))
+                    rows = [(key, vector.astype(np.float16).tobytes()) for key, vector in zip(missing, fresh)]
+                    with db:
+                        db.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+                    vectors.update(rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache unavailable, encoding without it: {e}")
+            return self._encode(texts)
+        
+        # Fresh vectors go through the same float16 round trip, so the index is
+        # identical whether or not the cache was warm
+        return np.stack([np.frombuffer(vectors[key], dtype=np.float16) for key in keys]).astype(np.float32)
+    
+    def _search_index(self, embeddings, top_k: int) -> List[List[Dict]]:
+        """Search the FAISS index for each (normalized) embedding row"""
+        with self._index_lock:
+            scores, indices = self.conversation_index.search(embeddings, top_k)
+            metadata = self.conversation_metadata
+        
+        all_results = []
+        for row_scores, row_indices in zip(scores, indices):
             results = []
-            for score, idx in zip(scores[0], indices[0]):
+            for score, idx in zip(row_scores, row_indices):
                 if idx != -1:
-                    result = self.conversation_metadata[idx].copy()
+                    result = metadata[idx].copy()
                     result['similarity_score'] = float(score)
                     results.append(result)
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error finding similar conversations: {e}")
-            return []
+            all_results.append(results)
+        return all_results
+    
+    def _cached_similar(self, cache_key: bytes, top_k: int) -> Optional[List[Dict]]:
+        """Copies of a fresh cached search with at least top_k hits, else None"""
+        cached = self._similar_cache.get(cache_key)
+        if cached is None:
+            return None
+        stored_at, cached_k, cached_results, generation = cached
+        if (time.monotonic() - stored_at > _SIMILAR_CACHE_TTL or cached_k < top_k
+                or generation != self._index_generation):
+            return None
+        self._similar_cache.move_to_end(cache_key)
+        return [dict(result) for result in cached_results[:top_k]]
+    
+    def _store_similar(self, cache_key: bytes, top_k: int, results: List[Dict],
+                       generation: Optional[int] = None) -> None:
+        """Cache a search result, evicting the least recently used entry when full"""
+        if generation is None:
+            generation = self._index_generation
+        self._similar_cache[cache_key] = (time.monotonic(), top_k, results, generation)
+        self._similar_cache.move_to_end(cache_key)
+        if len(self._similar_cache) > _SIMILAR_CACHE_MAX_ENTRIES:
+            self._similar_cache.popitem(last=False)
     
     def get_resolution_suggestions(self, issue_text: str, category: str = None) -> List[Dict]:
         """Get resolution suggestions based on similar cases"""
@@ -606,18 +1335,17 @@ class UnifiedCallCenterAI:
         try:
             insights = {}
             
-            patterns_to_analyze = {category: self.issue_patterns[category]} if category else self.issue_patterns
+            if category:
+                counts_to_report = {category: self._issue_counts[category]} if category in self._issue_counts else {}
+            else:
+                counts_to_report = self._issue_counts
             
-            for cat, patterns in patterns_to_analyze.items():
-                if patterns:
-                    total = len(patterns)
-                    resolved = sum(1 for p in patterns if p['resolved'])
-                    
-                    insights[cat] = {
-                        'total_cases': total,
-                        'resolved_cases': resolved,
-                        'resolution_rate': resolved / total if total > 0 else 0
-                    }
+            for cat, (total, resolved) in counts_to_report.items():
+                insights[cat] = {
+                    'total_cases': total,
+                    'resolved_cases': resolved,
+                    'resolution_rate': resolved / total if total > 0 else 0
+                }
             
             return insights
             
@@ -631,20 +1359,26 @@ class UnifiedCallCenterAI:
     
     async def provide_agent_assistance(self, 
                                      customer_message: str, 
-                                     conversation_history: List[Dict] = None) -> Dict[str, Any]:
-        """Provide real-time assistance to agents"""
+                                     conversation_history: List[Dict] = None,
+                                     on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Provide real-time assistance to agents
+        
+        If on_chunk is given, the suggested response is streamed from Bedrock
+        and each piece of text is passed to it as soon as it is generated.
+        """
         try:
-            if not self.knowledge_base_loaded:
-                await self.initialize_knowledge_base()
+            await self._ensure_knowledge_base()
             
-            # Analyze current message
+            # Analyze current message; Comprehend runs while the RAG lookup
+            # and Bedrock response generation proceed, as neither needs it
             urgency = self._detect_urgency(customer_message)
-            sentiment = await self._analyze_message_sentiment(customer_message)
+            sentiment_task = asyncio.create_task(self._analyze_message_sentiment(customer_message))
             
             # Get RAG suggestions
             rag_suggestions = []
             if self.ml_ready:
-                similar_cases = self.find_similar_conversations(customer_message)
+                similar_cases = await self.find_similar_conversations_async(customer_message)
                 category = self._detect_issue_category(customer_message)
                 resolution_suggestions = self.get_resolution_suggestions(customer_message, category)
                 
@@ -656,8 +1390,9 @@ class UnifiedCallCenterAI:
             
             # Generate enhanced response
             enhanced_response = await self._generate_agent_response(
-                customer_message, conversation_history, rag_suggestions
+                customer_message, conversation_history, rag_suggestions, on_chunk
             )
+            sentiment = await sentiment_task
             
             return {
                 'timestamp': datetime.now().isoformat(),
@@ -676,26 +1411,30 @@ class UnifiedCallCenterAI:
                 'fallback_response': "I understand your concern. Let me help you with that."
             }
     
+    async def batch_provide_agent_assistance(self,
+                                             customer_messages: List[str],
+                                             conversation_histories: Optional[List[List[Dict]]] = None) -> List[Dict]:
+        """
+        Assistance for many concurrent customer messages (e.g. one per live session)
+        
+        The messages are handled concurrently, so their similarity searches
+        share encoder batches and their Bedrock calls overlap up to the
+        in-flight limit.
+        """
+        histories = conversation_histories or [None] * len(customer_messages)
+        return await asyncio.gather(*[
+            self.provide_agent_assistance(message, history)
+            for message, history in zip(customer_messages, histories)
+        ])
+    
     def _detect_urgency(self, message: str) -> str:
         """Detect urgency level from message"""
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ['emergency', 'urgent', 'asap', 'immediately']):
-            return 'critical'
-        elif any(word in message_lower for word in ['frustrated', 'angry', 'unacceptable']):
-            return 'high'
-        elif any(word in message_lower for word in ['problem', 'issue', 'concerned']):
-            return 'medium'
-        else:
-            return 'low'
+        return _first_matching_tier(_URGENCY_PATTERNS, _URGENCY_AUTOMATON, message, 'low')
     
     async def _analyze_message_sentiment(self, message: str) -> Dict[str, Any]:
         """Quick sentiment analysis for a single message"""
         try:
-            response = self.comprehend_client.detect_sentiment(
-                Text=message[:1000],
-                LanguageCode='en'
-            )
+            response = await self._detect_sentiment(message[:1000])
             return {
                 'sentiment': response['Sentiment'],
                 'confidence': response['SentimentScore']
@@ -707,7 +1446,8 @@ class UnifiedCallCenterAI:
     async def _generate_agent_response(self, 
                                      customer_message: str, 
                                      history: List[Dict] = None,
-                                     rag_suggestions: Dict = None) -> str:
+                                     rag_suggestions: Dict = None,
+                                     on_chunk: Optional[Callable[[str], None]] = None) -> str:
         """Generate an enhanced agent response"""
         try:
             context = f"Customer message: {customer_message}\n"
@@ -718,22 +1458,17 @@ class UnifiedCallCenterAI:
             if rag_suggestions and rag_suggestions.get('suggestions'):
                 context += f"Similar case solutions: {json.dumps(rag_suggestions['suggestions'][:2])}\n"
             
-            prompt = f"""
-            As a professional customer service agent, craft a helpful response to this customer.
-            Be empathetic, solution-focused, and professional.
-            
-            Context:
-            {context}
+            prompt = _AGENT_RESPONSE_PROMPT_HEAD + context + _AGENT_RESPONSE_PROMPT_TAIL
             
-            Provide a clear, helpful response that:
-            1. Acknowledges the customer's concern
-            2. Offers a specific solution or next steps
-            3. Maintains a professional and empathetic tone
+            if on_chunk is None:
+                return await self._call_bedrock(prompt, max_tokens=300)
             
-            Agent Response:
-            """
-            
-            return await self._call_bedrock(prompt, max_tokens=300)
+            # Stream the draft so the caller can show it while it is generated
+            parts = []
+            async for text in self._call_bedrock_stream(prompt, max_tokens=300):
+                parts.append(text)
+                on_chunk(text)
+            return ''.join(parts).strip()
             
         except Exception as e:
             logger.error(f"Error generating agent response: {e}")
@@ -741,22 +1476,10 @@ class UnifiedCallCenterAI:
     
     def _get_recommended_actions(self, urgency: str, sentiment: Dict) -> List[str]:
         """Get recommended actions based on urgency and sentiment"""
-        actions = []
-        
-        if urgency == 'critical':
-            actions.append("Escalate to supervisor immediately")
-        elif urgency == 'high':
-            actions.append("Prioritize this customer")
-        
-        sentiment_level = sentiment.get('sentiment', 'NEUTRAL')
-        if sentiment_level == 'NEGATIVE':
-            actions.append("Use empathetic language")
-            actions.append("Acknowledge frustration")
-        
-        if not actions:
-            actions.append("Provide clear information")
-        
-        return actions
+        negative = sentiment.get('sentiment', 'NEUTRAL') == 'NEGATIVE'
+        # Urgency levels without actions of their own behave like 'low'
+        actions = _RECOMMENDED_ACTIONS.get((urgency, negative)) or _RECOMMENDED_ACTIONS[('low', negative)]
+        return list(actions)
     
     # =============================================================================
     # UTILITY METHODS
@@ -764,31 +1487,119 @@ class UnifiedCallCenterAI:
     
     async def _call_bedrock(self, prompt: str, max_tokens: int = 1000) -> str:
         """Call AWS Bedrock with standardized parameters"""
-        try:
-            request_body = {
-                "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
-                "max_tokens_to_sample": max_tokens,
-                "temperature": self.config['aws']['bedrock'].get('temperature', 0.7),
-                "top_p": 0.9,
-                "stop_sequences": ["\n\nHuman:"]
-            }
-            
-            response = self.bedrock_client.invoke_model(
-                modelId=self.config['aws']['bedrock']['model_id'],
-                contentType='application/json',
-                accept='application/json',
-                body=json.dumps(request_body)
+        # Identical prompts already in flight share one Bedrock call
+        key = (hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).digest(), max_tokens)
+        pending = self._bedrock_pending.get(key)
+        if pending is None:
+            # The shared request runs as its own task, so cancelling the
+            # caller that started it does not cancel the others awaiting it
+            pending = self._bedrock_pending[key] = asyncio.create_task(
+                self._request_completion(prompt, max_tokens)
             )
+            pending.add_done_callback(lambda task: self._finish_bedrock_request(key, task))
+        return await asyncio.shield(pending)
+    
+    def _finish_bedrock_request(self, key: Tuple[bytes, int], task: asyncio.Task):
+        """Drop a finished shared Bedrock request"""
+        del self._bedrock_pending[key]
+        # Mark a failure as retrieved even when every caller was cancelled
+        task.cancelled() or task.exception()
+    
+    async def _request_completion(self, prompt: str, max_tokens: int) -> str:
+        """Single Bedrock invoke_model round trip returning the completion text"""
+        try:
+            body = self._bedrock_request_body(prompt, max_tokens)
             
-            response_body = json.loads(response['body'].read())
+            # invoke_model blocks, so run it on the AWS I/O pool to let
+            # concurrent analyses overlap their Bedrock round trips
+            async with self._inflight('bedrock'):
+                response_body = await self._to_io(self._invoke_bedrock_model, body)
             return response_body.get('completion', '').strip()
             
         except Exception as e:
             logger.error(f"Error calling Bedrock: {e}")
             raise
     
+    async def _call_bedrock_stream(self, prompt: str, max_tokens: int = 1000) -> AsyncIterator[str]:
+        """Yield completion text from Bedrock as it is generated"""
+        body = self._bedrock_request_body(prompt, max_tokens)
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        finished = object()
+        
+        def pump():
+            # The event stream is a blocking iterator; relay its chunks from
+            # the I/O pool onto the event loop as they arrive
+            try:
+                response = self.bedrock_client.invoke_model_with_response_stream(
+                    modelId=self._bedrock_model_id,
+                    contentType='application/json',
+                    accept='application/json',
+                    body=body
+                )
+                for event in response['body']:
+                    chunk = event.get('chunk')
+                    if chunk:
+                        text = _json_loads(chunk['bytes']).get('completion', '')
+                        loop.call_soon_threadsafe(chunks.put_nowait, text)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, finished)
+        
+        async with self._inflight('bedrock'):
+            streaming = loop.run_in_executor(self._io_pool, pump)
+            while (text := await chunks.get()) is not finished:
+                if text:
+                    yield text
+            # Surface any error raised while streaming
+            await streaming
+    
+    def _bedrock_request_body(self, prompt: str, max_tokens: int) -> bytes:
+        """invoke_model request body; only the prompt varies per call"""
+        wrapped_prompt = f"\n\nHuman: {prompt}\n\nAssistant:"
+        body_head, body_tail = self._bedrock_body_template(max_tokens)
+        if ORJSON_AVAILABLE:
+            prompt_json = orjson.dumps(wrapped_prompt)
+        else:
+            prompt_json = json.dumps(wrapped_prompt).encode('utf-8')
+        return body_head + prompt_json + body_tail
+    
+    def _bedrock_body_template(self, max_tokens: int) -> Tuple[bytes, bytes]:
+        """Serialized request body split around the prompt value, cached per max_tokens"""
+        template = self._bedrock_body_templates.get(max_tokens)
+        if template is None:
+            skeleton = json.dumps({
+                "prompt": _PROMPT_PLACEHOLDER,
+                "max_tokens_to_sample": max_tokens,
+                "temperature": self._bedrock_temperature,
+                "top_p": 0.9,
+                "stop_sequences": ["\n\nHuman:"]
+            }).encode('utf-8')
+            head, _, tail = skeleton.partition(json.dumps(_PROMPT_PLACEHOLDER).encode('utf-8'))
+            template = self._bedrock_body_templates[max_tokens] = (head, tail)
+        return template
+    
+    def _invoke_bedrock_model(self, body) -> Dict[str, Any]:
+        """Blocking invoke_model call; returns the decoded response body"""
+        response = self.bedrock_client.invoke_model(
+            modelId=self._bedrock_model_id,
+            contentType='application/json',
+            accept='application/json',
+            body=body
+        )
+        return _json_loads(response['body'].read())
+    
+    @staticmethod
+    def _index_path(file_path: str) -> str:
+        """FAISS index file stored next to a knowledge base file"""
+        return os.path.splitext(file_path)[0] + '_index.faiss'
+    
     def save_knowledge_base(self, file_path: str) -> None:
-        """Save knowledge base to disk"""
+        """
+        Save knowledge base to disk
+        
+        The knowledge base is written as JSON, so loading it never executes
+        code from the file (unlike pickle); the FAISS index goes alongside.
+        """
         try:
             kb_data = {
                 'issue_patterns': dict(self.issue_patterns),
@@ -797,12 +1608,19 @@ class UnifiedCallCenterAI:
             }
             
             with open(file_path, 'wb') as f:
-                pickle.dump(kb_data, f)
+                if ORJSON_AVAILABLE:
+                    f.write(orjson.dumps(kb_data))
+                else:
+                    f.write(json.dumps(kb_data).encode('utf-8'))
             
-            # Save FAISS index
+            # Save FAISS index (GPU indexes are copied back to the CPU first)
             if self.conversation_index:
-                index_path = file_path.replace('.pkl', '_index.faiss')
-                faiss.write_index(self.conversation_index, index_path)
+                index_path = self._index_path(file_path)
+                with self._index_lock:
+                    index = self.conversation_index
+                    if hasattr(faiss, 'GpuIndex') and isinstance(index, faiss.GpuIndex):
+                        index = faiss.index_gpu_to_cpu(index)
+                    faiss.write_index(index, index_path)
             
             logger.info(f"Saved knowledge base to {file_path}")
             
@@ -810,19 +1628,30 @@ class UnifiedCallCenterAI:
             logger.error(f"Error saving knowledge base: {e}")
     
     def load_knowledge_base(self, file_path: str) -> None:
-        """Load knowledge base from disk"""
+        """Load knowledge base from disk (JSON, or a legacy .pkl file)"""
         try:
             with open(file_path, 'rb') as f:
-                kb_data = pickle.load(f)
+                if file_path.endswith('.pkl'):
+                    # Knowledge bases saved before the JSON format; only load trusted files
+                    kb_data = pickle.load(f)
+                else:
+                    kb_data = _json_loads(f.read())
             
             self.issue_patterns = defaultdict(list, kb_data['issue_patterns'])
+            self._count_issue_resolutions()
             self.resolution_templates = defaultdict(list, kb_data['resolution_templates'])
-            self.conversation_metadata = kb_data['conversation_metadata']
             
             # Load FAISS index
-            index_path = file_path.replace('.pkl', '_index.faiss')
+            index_path = self._index_path(file_path)
+            index = None
             if os.path.exists(index_path) and self.ml_ready:
-                self.conversation_index = faiss.read_index(index_path)
+                index = self._index_to_gpu(faiss.read_index(index_path))
+                self._configure_index(index)
+            with self._index_lock:
+                if index is not None:
+                    self.conversation_index = index
+                self.conversation_metadata = kb_data['conversation_metadata']
+                self._index_generation += 1
             
             logger.info(f"Loaded knowledge base from {file_path}")
             
@@ -866,7 +1695,29 @@ class UnifiedCallCenterAI:
         try:
             logger.info(f"Batch analyzing {len(conversations)} conversations")
             
-            tasks = [self.analyze_conversation(conv) for conv in conversations]
+            transcripts = [self._extract_transcript(conv) for conv in conversations]
+            
+            # Embed and search every transcript up front, in coalesced batches
+            # on the I/O pool so the encoder never blocks the event loop; the
+            # per-conversation RAG lookups then hit the similarity cache
+            if self.knowledge_base_loaded and self.ml_ready:
+                await asyncio.gather(
+                    *(self.find_similar_conversations_async(t) for t in transcripts if t)
+                )
+            
+            # Fetch Comprehend sentiment 25 transcripts per request instead of
+            # one request per conversation
+            sentiments: List[Optional[Dict[str, Any]]] = [None] * len(conversations)
+            if 'sentiment_analysis' in self.capabilities:
+                indexed = [(i, t[:_COMPREHEND_TEXT_CHARS]) for i, t in enumerate(transcripts) if t]
+                detected = await self._batch_detect_sentiments([text for _, text in indexed])
+                for (i, _), sentiment in zip(indexed, detected):
+                    sentiments[i] = sentiment
+            
+            tasks = [
+                self.analyze_conversation(conv, sentiment)
+                for conv, sentiment in zip(conversations, sentiments)
+            ]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             successful_results = []
@@ -0,0 +1,32 @@
+"""
+Tests for chat data loading in data_processor
+"""
+
+import json
+
+import pytest
+
+import data_processor
+
+
+@pytest.mark.parametrize('use_ijson', [False, True])
+def test_load_chat_dataframe_mixed_records(tmp_path, monkeypatch, use_ijson):
+    """Records missing optional keys load with NaN on both parser paths"""
+    if use_ijson and not data_processor.IJSON_AVAILABLE:
+        pytest.skip("ijson is not installed")
+    monkeypatch.setattr(data_processor, 'IJSON_AVAILABLE', use_ijson)
+    
+    records = [
+        {'conversation_id': 'c1', 'chat_text': 'hello', 'agent_id': 'a1'},
+        {'conversation_id': 'c2', 'chat_text': 'bill is wrong'},
+        {'conversation_id': 'c3', 'chat_text': 'thanks', 'rating': 4.5}
+    ]
+    path = tmp_path / 'chats.json'
+    path.write_text(json.dumps(records))
+    
+    df = data_processor._load_chat_dataframe(str(path))
+    
+    assert len(df) == 3
+    assert list(df['conversation_id']) == ['c1', 'c2', 'c3']
+    assert df['agent_id'].isna().tolist() == [False, True, True]
+    assert df['rating'].isna().tolist() == [True, True, False]